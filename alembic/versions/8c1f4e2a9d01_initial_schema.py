@@ -0,0 +1,66 @@
+"""initial schema
+
+Revision ID: 8c1f4e2a9d01
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+Databases created earlier with create_tables.py already have these tables:
+mark them with ``alembic stamp 8c1f4e2a9d01`` and then ``alembic upgrade head``.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c1f4e2a9d01'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('full_name', sa.String(), nullable=True),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('password', sa.String(), nullable=False),
+        sa.Column('role', sa.String(), nullable=True),
+        sa.Column('bio', sa.String(), nullable=True),
+        sa.Column('avatar', sa.String(), nullable=True),
+        sa.Column('refresh_token', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+
+    op.create_table(
+        'activities',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('category', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('carbon_output', sa.Float(), nullable=False),
+        sa.Column('eco_points', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('is_archived', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_activities_id'), 'activities', ['id'], unique=False)
+    op.create_index(op.f('ix_activities_name'), 'activities', ['name'], unique=False)
+    op.create_index(op.f('ix_activities_category'), 'activities', ['category'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_activities_category'), table_name='activities')
+    op.drop_index(op.f('ix_activities_name'), table_name='activities')
+    op.drop_index(op.f('ix_activities_id'), table_name='activities')
+    op.drop_table('activities')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_table('users')
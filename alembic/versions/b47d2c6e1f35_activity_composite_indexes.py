@@ -0,0 +1,48 @@
+"""composite indexes for per-user activity queries
+
+Revision ID: b47d2c6e1f35
+Revises: 8c1f4e2a9d01
+Create Date: 2026-10-17 09:05:00.000000
+
+Every activity route filters on user_id and then ranges over or orders by
+created_at, or groups by category. The partial index covers the common case of
+listing non-archived activities and is only created on backends that support
+partial indexes (PostgreSQL, SQLite).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b47d2c6e1f35'
+down_revision = '8c1f4e2a9d01'
+branch_labels = None
+depends_on = None
+
+PARTIAL_INDEX_DIALECTS = ('postgresql', 'sqlite')
+
+
+def upgrade() -> None:
+    # if_not_exists: databases created by create_all() may already have them
+    op.create_index(
+        'ix_activities_user_id_created_at', 'activities', ['user_id', 'created_at'],
+        unique=False, if_not_exists=True,
+    )
+    op.create_index(
+        'ix_activities_user_id_category', 'activities', ['user_id', 'category'],
+        unique=False, if_not_exists=True,
+    )
+    if op.get_bind().dialect.name in PARTIAL_INDEX_DIALECTS:
+        op.create_index(
+            'ix_activities_active_user_id_created_at', 'activities', ['user_id', 'created_at'],
+            unique=False, if_not_exists=True,
+            postgresql_where=sa.text('is_archived = false'),
+            sqlite_where=sa.text('is_archived = 0'),
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name in PARTIAL_INDEX_DIALECTS:
+        op.drop_index('ix_activities_active_user_id_created_at', table_name='activities', if_exists=True)
+    op.drop_index('ix_activities_user_id_category', table_name='activities', if_exists=True)
+    op.drop_index('ix_activities_user_id_created_at', table_name='activities', if_exists=True)
@@ -6,6 +6,50 @@ load_dotenv()
 
 class Settings(BaseSettings):
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    # Micro-batching of concurrent eco-points predictions (0 disables batching)
+    PREDICT_BATCH_WINDOW_MS: float = 2.0
+    PREDICT_MAX_BATCH_SIZE: int = 64
+    # Longest a caller waits for its batch before predicting inline instead
+    PREDICT_BATCH_TIMEOUT_SECONDS: float = 2.0
+    # Memoized eco-points predictions (size 0 disables; emission step 0 keeps exact values)
+    PREDICT_CACHE_SIZE: int = 4096
+    PREDICT_CACHE_TTL_SECONDS: float = 3600.0
+    PREDICT_CACHE_EMISSION_STEP: float = 0.0
+    # Background model training (forest n_jobs=-1 uses every core of the training process)
+    TRAINING_MAX_WORKERS: int = 1
+    TRAINING_DEFAULT_SAMPLES: int = 500
+    TRAINING_MAX_SAMPLES: int = 5_000_000
+    TRAINING_N_JOBS: int = 1
+    # How often each worker checks the model registry for a new version (0 disables)
+    MODEL_WATCH_INTERVAL_SECONDS: float = 10.0
+    # Versioned, memory-mapped model artifacts; populate at build time with scripts/export_model.py
+    MODEL_REGISTRY_DIR: str = "app/models/registry"
+    # Shared async OpenAI client: connection pool, keep-alive and request timeouts
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    OPENAI_TIMEOUT_SECONDS: float = 30.0
+    OPENAI_MAX_RETRIES: int = 2
+    # Cached LLM advice for templated prompts (size 0 disables; values are bucketed to the steps)
+    ADVICE_CACHE_SIZE: int = 2048
+    ADVICE_CACHE_TTL_SECONDS: float = 6 * 3600.0
+    ADVICE_CACHE_EMISSION_STEP: float = 0.5
+    ADVICE_CACHE_POINTS_STEP: float = 5.0
+    # Bulkhead for LLM calls: concurrent upstream calls, waiting callers and max wait
+    LLM_MAX_CONCURRENCY: int = 32
+    LLM_MAX_QUEUE: int = 256
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 10.0
+    # Circuit breaker for the LLM provider: calls failing or slower than the limit count as errors
+    LLM_BREAKER_FAILURE_RATE: float = 0.5
+    LLM_BREAKER_SLOW_CALL_SECONDS: float = 10.0
+    LLM_BREAKER_WINDOW: int = 20
+    LLM_BREAKER_MIN_CALLS: int = 5
+    LLM_BREAKER_OPEN_SECONDS: float = 30.0
+    # Deferred advice for /api/ai/log?defer_advice=true: worker tasks, queue bound, result lifetime
+    ADVICE_WORKERS: int = 4
+    ADVICE_MAX_PENDING: int = 1000
+    ADVICE_RESULT_TTL_SECONDS: float = 600.0
     # Add other settings as needed
 
 settings = Settings()
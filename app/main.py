@@ -10,7 +10,11 @@ from app.routes import (
     profile_router,
     ai_router,
 )
+from app.core.settings import settings
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.services.advice_jobs import advice_jobs
 from app.services.ai_service import ai_service
+from app.services.training_jobs import training_jobs
 
 app = FastAPI(title="EcoPulse API (SQLite)")
 
@@ -21,19 +25,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cursor pagination returns the next page's cursor in this header
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
-    # Load AI model if available
+    # Load AI model if available, then follow new versions published to the registry
     ai_service.load_model()
+    if settings.MODEL_WATCH_INTERVAL_SECONDS > 0:
+        ai_service.start_watcher(settings.MODEL_WATCH_INTERVAL_SECONDS)
+    # One pooled async OpenAI client shared by every chat request
+    ai_service.open_openai_client()
+    await advice_jobs.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
-    # Add any cleanup code here
-    pass
+    training_jobs.shutdown()
+    await advice_jobs.stop()
+    await ai_service.close_openai_client()
+    ai_service.close()
 
 app.include_router(auth_router)
 app.include_router(activities_router)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -34,3 +34,18 @@ class Activity(Base):
     is_archived = Column(Boolean, default=False)
 
     user = relationship("User", back_populates="activities")
+
+    # Kept in sync with the alembic migrations, which are how these are applied
+    __table_args__ = (
+        # Serves per-user date-range queries (dashboard, insights, monthly summaries)
+        Index("ix_activities_user_id_created_at", "user_id", "created_at"),
+        Index("ix_activities_user_id_category", "user_id", "category"),
+        # Non-archived listings; partial on PostgreSQL and SQLite
+        Index(
+            "ix_activities_active_user_id_created_at",
+            "user_id",
+            "created_at",
+            postgresql_where=text("is_archived = false"),
+            sqlite_where=text("is_archived = 0"),
+        ),
+    )
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from contextlib import aclosing
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from app import schemas
+from app.core.settings import settings
 from app.core.security import get_current_user
 from app import models
+from app.services.advice_jobs import advice_jobs
 from app.services.ai_service import ai_service
+from app.services.bulkhead import BACKGROUND
+from app.services.training_jobs import TrainingQueueFull, training_jobs
 from app.utils.emissions_calculator import EmissionsCalculator
 
 router = APIRouter(prefix="/api/ai", tags=["AI Assistant"])
@@ -11,14 +19,8 @@ router = APIRouter(prefix="/api/ai", tags=["AI Assistant"])
 # -------------------------#
 # Chat with AI
 # -------------------------#
-@router.post("/chat", response_model=schemas.AIChatResponse)
-async def chat_with_ai(
-    request: schemas.AIChatRequest,
-    current_user: models.User = Depends(get_current_user),
-):
-    # Use AI for general eco-related responses
-    message = request.message
-
+def _detect_activity(message: str):
+    """Extract activity context from a chat message and predict its eco points"""
     # Optional: Extract activity information from message (simplified parsing) for context
     activity = None
     category = None
@@ -59,26 +61,111 @@ async def chat_with_ai(
     if activity and category and carbon_emission is not None:
         eco_points = ai_service.predict_eco_points(activity, category, carbon_emission)
 
+    return activity, category, carbon_emission, eco_points
+
+
+@router.post("/chat", response_model=schemas.AIChatResponse)
+async def chat_with_ai(
+    request: schemas.AIChatRequest,
+    current_user: models.User = Depends(get_current_user),
+):
+    # Use AI for general eco-related responses
+    message = request.message
+    activity, category, carbon_emission, eco_points = _detect_activity(message)
+
     # Generate response (can handle general questions or activity-specific advice)
     response = await ai_service.generate_response(message, activity, category, carbon_emission, eco_points)
 
     return {"response": response}
 
 
+@router.post("/chat/stream")
+async def chat_with_ai_stream(
+    request: schemas.AIChatRequest,
+    http_request: Request,
+    current_user: models.User = Depends(get_current_user),
+):
+    """Stream the chat response as server-sent events.
+
+    Each text delta is sent as ``data: {"delta": "..."}``, followed by ``event: done``.
+    The upstream completion is closed as soon as the client disconnects.
+    """
+    message = request.message
+    activity, category, carbon_emission, eco_points = _detect_activity(message)
+
+    async def events():
+        stream = ai_service.stream_response(message, activity, category, carbon_emission, eco_points)
+        async with aclosing(stream):
+            async for text in stream:
+                if await http_request.is_disconnected():
+                    return
+                yield f"data: {json.dumps({'delta': text})}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# -------------------------#
+# AI Service Stats
+# -------------------------#
+@router.get("/stats", response_model=dict)
+def get_ai_stats():
+    """Model, cache, batching and LLM concurrency counters for monitoring"""
+    return {**ai_service.stats(), "deferred_advice": advice_jobs.stats()}
+
+
 # -------------------------#
 # Train AI Model
 # -------------------------#
-@router.post("/train", response_model=dict)
-def train_ai_model():
-    """Train the AI model with synthetic data"""
+@router.post("/train", response_model=schemas.TrainingJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def train_ai_model(
+    request: Optional[schemas.TrainRequest] = None,
+    current_user: models.User = Depends(get_current_user),
+):
+    """Start training the AI model in a background process.
+
+    ``source="synthetic"`` (default) trains on generated data; ``source="activities"``
+    trains on logged activities, optionally limited to ``[since, until)`` and sampled.
+    The new model is swapped in when the job completes; poll GET /api/ai/train/{job_id}.
+    Parallelism comes from TRAINING_N_JOBS; while TRAINING_MAX_WORKERS jobs are queued
+    or running, new requests get 429.
+    """
+    request = request or schemas.TrainRequest()
+    n_jobs = settings.TRAINING_N_JOBS
+
+    if request.source == "activities":
+        if request.sample_rate is not None and not 0 < request.sample_rate <= 1:
+            raise HTTPException(status_code=400, detail="sample_rate must be in (0, 1]")
+        options = {"since": request.since, "until": request.until, "sample_rate": request.sample_rate}
+        n_samples = None
+    elif request.source == "synthetic":
+        options = None
+        n_samples = request.n_samples or settings.TRAINING_DEFAULT_SAMPLES
+        if not 10 <= n_samples <= settings.TRAINING_MAX_SAMPLES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"n_samples must be between 10 and {settings.TRAINING_MAX_SAMPLES}"
+            )
+    else:
+        raise HTTPException(status_code=400, detail=f"Unknown training source: {request.source}")
+
     try:
-        result = ai_service.train_model(500)
-        return {
-            "message": "AI model trained successfully with 500 examples (80/20 split)",
-            "metrics": result
-        }
-    except Exception as e:
-        return {"error": f"Training failed: {str(e)}"}
+        return training_jobs.submit(n_samples, n_jobs=n_jobs, source=request.source, options=options)
+    except TrainingQueueFull as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+
+
+@router.get("/train/{job_id}", response_model=schemas.TrainingJobResponse)
+def get_training_job(job_id: str, current_user: models.User = Depends(get_current_user)):
+    """Status, progress and metrics of a training job"""
+    job = training_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Training job not found")
+    return job
 
 
 # -------------------------#
@@ -99,6 +186,8 @@ async def predict_eco_points(request: dict):
             category,
             carbon_emission,
             eco_points,
+            template="predict",
+            priority=BACKGROUND,
         )
 
         return {
@@ -112,12 +201,56 @@ async def predict_eco_points(request: dict):
         return {"error": f"Prediction failed: {str(e)}"}
 
 
+# -------------------------#
+# Batch Predict Eco Points
+# -------------------------#
+MAX_BATCH_PREDICT_ITEMS = 1000
+
+
+@router.post("/predict/batch", response_model=schemas.BatchPredictResponse)
+def predict_eco_points_batch(
+    request: schemas.BatchPredictRequest,
+    current_user: models.User = Depends(get_current_user),
+):
+    """Predict eco points for many activities at once (used by mobile sync)"""
+    if len(request.items) > MAX_BATCH_PREDICT_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_PREDICT_ITEMS} items can be predicted per request"
+        )
+
+    try:
+        predictions = ai_service.predict_eco_points_batch(
+            [item.activity for item in request.items],
+            [item.category for item in request.items],
+            [item.carbon_emission for item in request.items],
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch prediction failed: {str(e)}"
+        )
+
+    return {
+        "predictions": predictions,
+        "prediction_type": "model" if ai_service.is_trained else "fallback",
+    }
+
+
 # -------------------------#
 # Log Activity with AI
 # -------------------------#
 @router.post("/log", response_model=dict)
-async def add_log_with_ai(request: dict, current_user: models.User = Depends(get_current_user)):
-    """Create a log entry with calculated emissions and eco points"""
+async def add_log_with_ai(
+    request: dict,
+    defer_advice: bool = False,
+    current_user: models.User = Depends(get_current_user),
+):
+    """Create a log entry with calculated emissions and eco points.
+
+    With ``defer_advice=true`` the response is returned without waiting for the LLM:
+    ``advice`` is null and ``advice_id`` can be fetched from GET /api/ai/advice/{advice_id}.
+    """
     try:
         # Calculate carbon emissions using the calculator
         carbon_emission = EmissionsCalculator.calculate_emissions(request)
@@ -129,14 +262,21 @@ async def add_log_with_ai(request: dict, current_user: models.User = Depends(get
         # Calculate eco points using AI service
         eco_points = ai_service.predict_eco_points(activity, category, carbon_emission)
         
-        # Generate advice using AI
-        advice = await ai_service.generate_response(
-            f"I logged {activity} in {category} with {carbon_emission}kg CO2",
-            activity,
-            category,
-            carbon_emission,
-            eco_points
-        )
+        # Generate advice using AI, now or in the background
+        message = f"I logged {activity} in {category} with {carbon_emission}kg CO2"
+        advice, advice_id = None, None
+        if defer_advice:
+            advice_id = advice_jobs.submit(current_user.id, message, activity, category, carbon_emission, eco_points)
+        else:
+            advice = await ai_service.generate_response(
+                message,
+                activity,
+                category,
+                carbon_emission,
+                eco_points,
+                template="log",
+                priority=BACKGROUND,
+            )
 
         return {
             "activity": activity,
@@ -148,6 +288,7 @@ async def add_log_with_ai(request: dict, current_user: models.User = Depends(get
             "carbon_emission": round(carbon_emission, 3),
             "eco_points": eco_points,
             "advice": advice,
+            "advice_id": advice_id,
             "original_log": request
         }
     except Exception as e:
@@ -157,6 +298,19 @@ async def add_log_with_ai(request: dict, current_user: models.User = Depends(get
         )
 
 
+@router.get("/advice/{advice_id}", response_model=schemas.AdviceResponse)
+async def get_deferred_advice(
+    advice_id: str,
+    wait: float = 0.0,
+    current_user: models.User = Depends(get_current_user),
+):
+    """Deferred advice from /api/ai/log; ``wait`` (up to 30s) long-polls until it is ready"""
+    job = await advice_jobs.wait(advice_id, min(max(wait, 0.0), 30.0))
+    if not job or job["user_id"] != current_user.id:
+        raise HTTPException(status_code=404, detail="Advice not found")
+    return job
+
+
 # -------------------------#
 # Calculate Eco Points
 # -------------------------#
@@ -178,7 +332,9 @@ async def calculate_eco_points(
             request.activity,
             request.category,
             request.carbon_emission,
-            eco_points
+            eco_points,
+            template="calculate_points",
+            priority=BACKGROUND,
         )
         
         return {
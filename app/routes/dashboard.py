@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
+from typing import List, Optional
+from datetime import timedelta
 from app import models, schemas
 from app.database import get_db
 from app.core.security import get_current_user
+from app.utils.activity_stats import bucketed_emissions
+from app.utils.pagination import NEXT_CURSOR_HEADER, keyset_page
 
 router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
 
@@ -17,27 +19,15 @@ def get_dashboard_stats(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    # Total emissions
-    total_emissions = db.query(func.sum(models.Activity.carbon_output)).filter(
-        models.Activity.user_id == current_user.id
-    ).scalar() or 0.0
+    # Total emissions and the last 7 days' emissions per day, in one query
+    stats = bucketed_emissions(db, current_user.id, timedelta(days=1), 7)
+    total_emissions = stats.total_emissions
 
     # Eco score (simplified: lower emissions = higher score)
     eco_score = max(0, 100 - total_emissions * 10)
 
-    # Weekly trend (last 7 days emissions)
-    from datetime import datetime, timedelta
-    seven_days_ago = datetime.utcnow() - timedelta(days=7)
-    weekly_activities = db.query(models.Activity).filter(
-        models.Activity.user_id == current_user.id,
-        models.Activity.created_at >= seven_days_ago
-    ).all()
-
-    weekly_trend = [0.0] * 7
-    for activity in weekly_activities:
-        day_index = (datetime.utcnow() - activity.created_at).days
-        if day_index < 7:
-            weekly_trend[6 - day_index] += activity.carbon_output
+    # Weekly trend (last 7 days emissions, oldest first)
+    weekly_trend = stats.emissions[::-1]
 
     return {
         "total_emissions": total_emissions,
@@ -51,12 +41,20 @@ def get_dashboard_stats(
 # -------------------------#
 @router.get("/activities", response_model=List[schemas.ActivityResponse])
 def get_recent_activities(
+    response: Response,
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = Query(None, description=f"Value of a previous page's {NEXT_CURSOR_HEADER} header"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    activities = db.query(models.Activity).filter(models.Activity.user_id == current_user.id).order_by(
-        models.Activity.created_at.desc()
-    ).offset(skip).limit(limit).all()
+    query = db.query(models.Activity).filter(models.Activity.user_id == current_user.id)
+    try:
+        activities, next_cursor = keyset_page(
+            query, models.Activity.created_at, models.Activity.id, limit, cursor=cursor, skip=skip
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return activities
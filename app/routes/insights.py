@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
-from typing import List
+from sqlalchemy import func
+from typing import List, Optional
 from datetime import datetime, timedelta
 from app import models, schemas
 from app.database import get_db
 from app.core.security import get_current_user
+from app.utils.activity_stats import bucketed_emissions, emissions_between, month_range
 
 router = APIRouter(prefix="/api/insights", tags=["Insights"])
 
@@ -15,32 +16,19 @@ router = APIRouter(prefix="/api/insights", tags=["Insights"])
 # -------------------------#
 @router.get("/weekly", response_model=List[schemas.WeeklyInsight])
 def get_weekly_insights(
+    weeks: int = Query(4, ge=1, le=52),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    # Get last 4 weeks
-    insights = []
-    for i in range(4):
-        week_start = datetime.utcnow() - timedelta(weeks=i+1)
-        week_end = datetime.utcnow() - timedelta(weeks=i)
-
-        weekly_data = db.query(
-            func.sum(models.Activity.carbon_output),
-            func.count(models.Activity.id)
-        ).filter(
-            models.Activity.user_id == current_user.id,
-            models.Activity.created_at >= week_start,
-            models.Activity.created_at < week_end
-        ).first()
-
-        emissions = weekly_data[0] or 0.0 if weekly_data else 0.0
-        activities = weekly_data[1] or 0 if weekly_data else 0
+    # Last N weeks (most recent first) in one grouped query, zero-filled
+    stats = bucketed_emissions(db, current_user.id, timedelta(weeks=1), weeks, with_totals=False)
 
-        week_str = f"Week {4-i}"
+    insights = []
+    for i in range(weeks):
         insights.append({
-            "week": week_str,
-            "emissions": emissions,
-            "activities": activities
+            "week": f"Week {weeks - i}",
+            "emissions": stats.emissions[i],
+            "activities": stats.counts[i]
         })
 
     return insights
@@ -79,22 +67,23 @@ def get_category_insights(
 # -------------------------#
 @router.get("/summary", response_model=schemas.MonthlySummary)
 def get_monthly_summary(
+    month: Optional[str] = Query(None, description="Month to summarize as YYYY-MM (default: current month)"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    current_month = datetime.utcnow().replace(day=1)
-
-    monthly_data = db.query(
-        func.sum(models.Activity.carbon_output).label('total_emissions'),
-        func.count(models.Activity.id).label('activities_count')
-    ).filter(
-        models.Activity.user_id == current_user.id,
-        extract('year', models.Activity.created_at) == current_month.year,
-        extract('month', models.Activity.created_at) == current_month.month
-    ).first()
-
-    total_emissions = monthly_data[0] or 0.0 if monthly_data else 0.0
-    activities_count = monthly_data[1] or 0 if monthly_data else 0
+    if month:
+        try:
+            current_month = datetime.strptime(month, "%Y-%m")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="month must be formatted as YYYY-MM")
+    else:
+        current_month = datetime.utcnow().replace(day=1)
+
+    try:
+        start, end = month_range(current_month.year, current_month.month)
+    except ValueError:  # the month after 9999-12 is not a datetime
+        raise HTTPException(status_code=400, detail="month is out of range")
+    total_emissions, activities_count = emissions_between(db, current_user.id, start, end)
     eco_score = max(0, 100 - total_emissions * 5)  # Simplified eco score
 
     return {
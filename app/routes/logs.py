@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app import models, schemas
 from app.database import get_db
 from app.core.security import get_current_user
 from app.services.ai_service import ai_service
 from app.utils.emissions_calculator import EmissionsCalculator
+from app.utils.pagination import NEXT_CURSOR_HEADER, keyset_page
 
 router = APIRouter(prefix="/api/logs", tags=["Logs"])
 
@@ -62,12 +63,22 @@ def create_log(
 # -------------------------#
 @router.get("/", response_model=List[schemas.ActivityResponse])
 def get_logs(
+    response: Response,
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = Query(None, description=f"Value of a previous page's {NEXT_CURSOR_HEADER} header"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    activities = db.query(models.Activity).filter(models.Activity.user_id == current_user.id).offset(skip).limit(limit).all()
+    query = db.query(models.Activity).filter(models.Activity.user_id == current_user.id)
+    try:
+        activities, next_cursor = keyset_page(
+            query, models.Activity.created_at, models.Activity.id, limit, cursor=cursor, skip=skip
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return activities
 
 
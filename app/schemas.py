@@ -172,6 +172,14 @@ class AIChatResponse(BaseModel):
     response: str
 
 
+class AdviceResponse(BaseModel):
+    advice_id: str
+    status: str  # "pending" or "ready"
+    advice: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+
 class CalculatePointsRequest(BaseModel):
     activity: str
     category: str
@@ -182,3 +190,40 @@ class CalculatePointsResponse(BaseModel):
     eco_points: float
     prediction_type: str  # "model" or "fallback"
     message: str
+
+
+class PredictItem(BaseModel):
+    activity: str
+    category: str
+    carbon_emission: float
+
+
+class BatchPredictRequest(BaseModel):
+    items: list[PredictItem]
+
+
+class BatchPredictResponse(BaseModel):
+    predictions: list[float]
+    prediction_type: str  # "model" or "fallback"
+
+
+class TrainRequest(BaseModel):
+    source: str = "synthetic"  # "synthetic" or "activities"
+    n_samples: Optional[int] = None  # synthetic only
+    since: Optional[datetime] = None  # activities only: created_at >= since
+    until: Optional[datetime] = None  # activities only: created_at < until
+    sample_rate: Optional[float] = None  # activities only: fraction of rows to keep
+
+
+class TrainingJobResponse(BaseModel):
+    job_id: str
+    status: str  # "queued", "running", "completed", "failed" or "cancelled"
+    stage: str
+    progress: float
+    source: str = "synthetic"
+    n_samples: Optional[int] = None
+    n_jobs: Optional[int] = None
+    submitted_at: datetime
+    finished_at: Optional[datetime] = None
+    metrics: Optional[dict] = None
+    error: Optional[str] = None
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from app.core.settings import settings
+from app.services.ai_service import AIService, ai_service
+from app.services.bulkhead import BACKGROUND
+from app.services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class AdviceJobManager:
+    """Generate LLM advice in background asyncio workers so requests don't wait for it.
+
+    ``submit`` queues a prompt and returns an advice id at once; a fixed pool of worker
+    tasks drains the queue through ``AIService.generate_response`` (so the advice cache,
+    single-flight, bulkhead and circuit breaker all apply). Results are kept for
+    ``result_ttl`` seconds and can be polled or awaited with ``wait``.
+    """
+
+    def __init__(self, service: AIService, workers: int = 4, max_pending: int = 1000,
+                 max_results: int = 10000, result_ttl: float = 600.0):
+        self.service = service
+        self.workers = workers
+        self.max_pending = max_pending
+        self.jobs = TTLCache(maxsize=max_results, ttl=result_ttl)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._loop = None
+        self.shed = 0
+
+    async def start(self):
+        self._ensure_started()
+
+    async def stop(self):
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue = None
+        self._loop = None
+
+    def submit(self, user_id: int, message: str, activity: str, category: str,
+               carbon_emission: float, eco_points: float) -> str:
+        """Queue advice generation and return its id; must be called on the event loop"""
+        self._ensure_started()
+        advice_id = uuid.uuid4().hex
+        job = {
+            "advice_id": advice_id,
+            "user_id": user_id,
+            "status": "pending",
+            "advice": None,
+            "created_at": datetime.utcnow().isoformat(),
+            "completed_at": None,
+            "done": asyncio.Event(),
+        }
+        self.jobs.set(advice_id, job)
+        try:
+            self._queue.put_nowait((job, (message, activity, category, carbon_emission, eco_points)))
+        except asyncio.QueueFull:
+            # Too far behind: answer from the fallbacks rather than queueing without bound
+            self.shed += 1
+            self._complete(job, self.service._generate_fallback_response(category))
+        return advice_id
+
+    def get(self, advice_id: str) -> Optional[dict]:
+        job = self.jobs.get(advice_id)
+        return self._public(job) if job else None
+
+    async def wait(self, advice_id: str, timeout: float) -> Optional[dict]:
+        """Return the job once its advice is ready, or as it is after ``timeout`` seconds"""
+        job = self.jobs.get(advice_id)
+        if job is None:
+            return None
+        if timeout > 0 and job["status"] == "pending":
+            try:
+                await asyncio.wait_for(job["done"].wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self._public(job)
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_pending": self.max_pending,
+            "shed": self.shed,
+            "results": self.jobs.stats(),
+        }
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._tasks and self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._tasks = [loop.create_task(self._worker(), name=f"advice-worker-{i}") for i in range(self.workers)]
+
+    async def _worker(self):
+        while True:
+            job, args = await self._queue.get()
+            try:
+                advice = await self.service.generate_response(*args, template="log", priority=BACKGROUND)
+            except Exception as e:
+                logger.error(f"Deferred advice {job['advice_id']} failed: {e}")
+                advice = self.service._generate_fallback_response(args[2])
+            finally:
+                self._queue.task_done()
+            self._complete(job, advice)
+
+    @staticmethod
+    def _complete(job: dict, advice: str):
+        job.update(status="ready", advice=advice, completed_at=datetime.utcnow().isoformat())
+        job["done"].set()
+
+    @staticmethod
+    def _public(job: dict) -> dict:
+        return {key: value for key, value in job.items() if key != "done"}
+
+
+advice_jobs = AdviceJobManager(
+    ai_service,
+    workers=settings.ADVICE_WORKERS,
+    max_pending=settings.ADVICE_MAX_PENDING,
+    result_ttl=settings.ADVICE_RESULT_TTL_SECONDS,
+)
@@ -1,17 +1,25 @@
-import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import LabelEncoder, StandardScaler
-from sklearn.metrics import mean_squared_error, r2_score
-import joblib
 import os
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any, AsyncIterator, Callable, Iterator, List, Sequence
 import random
+import time
 import logging
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from app.core.settings import settings
+from app.services.batching import MicroBatchDispatcher
+from app.services.bulkhead import INTERACTIVE, Bulkhead, BulkheadFull
+from app.services.cache import TTLCache
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.model_artifacts import ArtifactVersionError, ModelArtifact
+from app.services.model_registry import ModelRegistry, RegistryError, RegistryWatcher
+from app.services.singleflight import SingleFlight
 import asyncio
 
+# pandas, scikit-learn and joblib are only needed to train or to read the legacy pickles.
+# They are imported inside those code paths so serving workers never pay their import cost.
+if TYPE_CHECKING:
+    import pandas as pd
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,16 +30,190 @@ except ImportError:
     logger.warning("OpenAI package not installed. Using fallback responses.")
     openai = None
 
+# Substrings that mark an activity as sustainable (shared by training and prediction)
+SUSTAINABLE_KEYWORDS = (
+    "solar",
+    "electric",
+    "cycling",
+    "walking",
+    "recycling",
+    "compost",
+    "local",
+    "second-hand",
+    "plant-based",
+)
+
+CATEGORY_MULTIPLIERS = {
+    "Transportation": 1.2,
+    "Food": 1.0,
+    "Energy": 1.3,
+    "Waste": 0.8,
+    "Shopping": 0.9,
+    "Lifestyle": 0.7,
+}
+
+# Typical carbon emission range (kg CO2) per category, used for synthetic training data
+CATEGORY_EMISSIONS = {
+    "Transportation": {"min": 0.1, "max": 50.0, "avg": 15.0},
+    "Food": {"min": 0.5, "max": 30.0, "avg": 8.0},
+    "Energy": {"min": 1.0, "max": 100.0, "avg": 25.0},
+    "Waste": {"min": 0.1, "max": 20.0, "avg": 5.0},
+    "Shopping": {"min": 0.5, "max": 40.0, "avg": 12.0},
+    "Lifestyle": {"min": 0.2, "max": 25.0, "avg": 7.0},
+}
+
+ACTIVITY_TEMPLATES = {
+    "Transportation": [
+        "Driving to work",
+        "Flight to NYC",
+        "Bus commute",
+        "Cycling",
+        "Walking",
+        "Electric car trip",
+    ],
+    "Food": [
+        "Beef dinner",
+        "Vegetarian meal",
+        "Fast food",
+        "Local produce",
+        "Imported fruit",
+        "Plant-based diet",
+    ],
+    "Energy": [
+        "Home electricity",
+        "Heating bill",
+        "Solar panels",
+        "LED bulbs",
+        "Appliance usage",
+        "Renewable energy",
+    ],
+    "Waste": [
+        "Plastic bottles",
+        "Paper recycling",
+        "Composting",
+        "Landfill waste",
+        "E-waste",
+        "Textile recycling",
+    ],
+    "Shopping": [
+        "New clothes",
+        "Electronics",
+        "Local products",
+        "Second-hand items",
+        "Bulk buying",
+        "Minimalist purchase",
+    ],
+    "Lifestyle": [
+        "Water usage",
+        "Air conditioning",
+        "Home office",
+        "Gardening",
+        "Pet care",
+        "Home maintenance",
+    ],
+}
+
+
+def _generate_training_chunk(rng: np.random.Generator, n_samples: int) -> "pd.DataFrame":
+    """Draw n_samples synthetic activities with whole-array operations"""
+    import pandas as pd
+
+    names = np.array(list(CATEGORY_EMISSIONS))
+    low = np.array([CATEGORY_EMISSIONS[c]["min"] for c in names])
+    high = np.array([CATEGORY_EMISSIONS[c]["max"] for c in names])
+    avg = np.array([CATEGORY_EMISSIONS[c]["avg"] for c in names])
+    multipliers = np.array([CATEGORY_MULTIPLIERS[c] for c in names])
+
+    # Pad template lists into a (categories, max_templates) table
+    counts = np.array([len(ACTIVITY_TEMPLATES[c]) for c in names])
+    templates = np.full((len(names), counts.max()), "", dtype=object)
+    for i, category in enumerate(names):
+        templates[i, : counts[i]] = ACTIVITY_TEMPLATES[category]
+
+    category_idx = rng.integers(0, len(names), size=n_samples)
+    template_idx = (rng.random(n_samples) * counts[category_idx]).astype(int)
+
+    # Carbon emission based on category, clipped to the category's range
+    carbon_emission = rng.normal(avg[category_idx], avg[category_idx] * 0.3)
+    carbon_emission = np.clip(carbon_emission, low[category_idx], high[category_idx])
+
+    # Eco points formula: base points minus emission penalty, plus category bonus
+    eco_points = np.maximum(0, 100 - carbon_emission * 2 + multipliers[category_idx] * 10)
+
+    return pd.DataFrame(
+        {
+            "activity": templates[category_idx, template_idx],
+            "category": names[category_idx],
+            "carbon_emission": np.round(carbon_emission, 2),
+            "eco_points": np.round(eco_points, 1),
+        }
+    )
+
+
+def _dump_atomic(obj, path: str):
+    """joblib.dump to a temporary file and rename it over ``path``"""
+    import joblib
+
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    joblib.dump(obj, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
 
 class AIService:
     def __init__(self):
         self.model_path = "app/models/ai_model.pkl"
         self.encoder_path = "app/models/label_encoder.pkl"
         self.scaler_path = "app/models/scaler.pkl"
-        self.model = None
-        self.encoder = None
-        self.scaler = None
+        self.registry_dir = settings.MODEL_REGISTRY_DIR
+        self.artifact = None
+        self.model_version = None
+        self.watcher = None
         self.is_trained = False
+        # Bumped on every model swap; part of each cache key so stale results are never served
+        self.model_generation = 0
+        self.prediction_cache = None
+        if settings.PREDICT_CACHE_SIZE > 0:
+            self.prediction_cache = TTLCache(
+                maxsize=settings.PREDICT_CACHE_SIZE,
+                ttl=settings.PREDICT_CACHE_TTL_SECONDS or None,
+            )
+        self.advice_cache = None
+        if settings.ADVICE_CACHE_SIZE > 0:
+            self.advice_cache = TTLCache(
+                maxsize=settings.ADVICE_CACHE_SIZE,
+                ttl=settings.ADVICE_CACHE_TTL_SECONDS or None,
+            )
+        # LLM calls run behind their own concurrency limit so a slow provider cannot starve CRUD traffic
+        self.llm_bulkhead = Bulkhead(settings.LLM_MAX_CONCURRENCY, settings.LLM_MAX_QUEUE, name="llm")
+        # Skips the provider entirely while it is failing or slow, so callers get the fallback at once
+        self.llm_breaker = CircuitBreaker(
+            "openai",
+            failure_rate=settings.LLM_BREAKER_FAILURE_RATE,
+            slow_call_seconds=settings.LLM_BREAKER_SLOW_CALL_SECONDS,
+            window=settings.LLM_BREAKER_WINDOW,
+            min_calls=settings.LLM_BREAKER_MIN_CALLS,
+            open_seconds=settings.LLM_BREAKER_OPEN_SECONDS,
+        )
+        # Identical prompts in flight at the same time share one upstream completion
+        self.completions_in_flight = SingleFlight()
+        # AsyncOpenAI client, opened on startup (or on first use) and shared by every chat
+        self.openai_client = None
+        self.dispatcher = None
+        if settings.PREDICT_BATCH_WINDOW_MS > 0:
+            self.dispatcher = MicroBatchDispatcher(
+                lambda rows: self.predict_eco_points_batch(*zip(*rows), lookup_cache=False),
+                window_ms=settings.PREDICT_BATCH_WINDOW_MS,
+                max_batch_size=settings.PREDICT_MAX_BATCH_SIZE,
+                name="eco-points-batcher",
+            )
         self.fallback_responses = {
             "Transportation": [
                 "Consider using public transport or cycling for shorter trips.",
@@ -55,146 +237,125 @@ class AIService:
             ],
         }
 
-    def generate_training_data(self, n_samples: int = 500) -> pd.DataFrame:
+    def generate_training_data(self, n_samples: int = 500, seed: int = 42) -> "pd.DataFrame":
         """Generate synthetic training data for eco-points prediction"""
-        np.random.seed(42)
-
-        # Define categories and their typical carbon emissions ranges
-        categories = {
-            "Transportation": {"min": 0.1, "max": 50.0, "avg": 15.0},
-            "Food": {"min": 0.5, "max": 30.0, "avg": 8.0},
-            "Energy": {"min": 1.0, "max": 100.0, "avg": 25.0},
-            "Waste": {"min": 0.1, "max": 20.0, "avg": 5.0},
-            "Shopping": {"min": 0.5, "max": 40.0, "avg": 12.0},
-            "Lifestyle": {"min": 0.2, "max": 25.0, "avg": 7.0},
-        }
+        return _generate_training_chunk(np.random.default_rng(seed), n_samples)
+
+    def iter_training_data(self, n_samples: int, chunk_size: int = 100_000,
+                           seed: int = 42) -> Iterator["pd.DataFrame"]:
+        """Yield synthetic training data in DataFrames of at most ``chunk_size`` rows.
+
+        Only one chunk is in memory at a time, so very large datasets can be streamed to
+        disk or into an incremental learner.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        rng = np.random.default_rng(seed)
+        remaining = n_samples
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            yield _generate_training_chunk(rng, size)
+            remaining -= size
+
+    def train_model(self, n_samples: int = 500, n_jobs: Optional[int] = None,
+                    progress: Optional[Callable[[str, float], None]] = None):
+        """Train the AI model using 80/20 split.
+
+        ``n_jobs`` is passed to the forest; ``progress`` is called with (stage, fraction) as
+        training advances. Blocks for the whole fit, so request handlers should go through
+        the background training jobs instead of calling this directly.
+        """
+        from sklearn.preprocessing import LabelEncoder
+
+        progress = progress or (lambda stage, fraction: None)
 
-        data = []
-
-        for _ in range(n_samples):
-            category = np.random.choice(list(categories.keys()))
-            cat_info = categories[category]
-
-            # Generate carbon emission based on category
-            carbon_emission = np.random.normal(cat_info["avg"], cat_info["avg"] * 0.3)
-            carbon_emission = max(cat_info["min"], min(cat_info["max"], carbon_emission))
-
-            # Generate activity name based on category
-            activity_templates = {
-                "Transportation": [
-                    "Driving to work",
-                    "Flight to NYC",
-                    "Bus commute",
-                    "Cycling",
-                    "Walking",
-                    "Electric car trip",
-                ],
-                "Food": [
-                    "Beef dinner",
-                    "Vegetarian meal",
-                    "Fast food",
-                    "Local produce",
-                    "Imported fruit",
-                    "Plant-based diet",
-                ],
-                "Energy": [
-                    "Home electricity",
-                    "Heating bill",
-                    "Solar panels",
-                    "LED bulbs",
-                    "Appliance usage",
-                    "Renewable energy",
-                ],
-                "Waste": [
-                    "Plastic bottles",
-                    "Paper recycling",
-                    "Composting",
-                    "Landfill waste",
-                    "E-waste",
-                    "Textile recycling",
-                ],
-                "Shopping": [
-                    "New clothes",
-                    "Electronics",
-                    "Local products",
-                    "Second-hand items",
-                    "Bulk buying",
-                    "Minimalist purchase",
-                ],
-                "Lifestyle": [
-                    "Water usage",
-                    "Air conditioning",
-                    "Home office",
-                    "Gardening",
-                    "Pet care",
-                    "Home maintenance",
-                ],
-            }
-
-            activity = np.random.choice(activity_templates[category])
-
-            # Calculate eco points (higher points for lower emissions, with category multipliers)
-            category_multipliers = {
-                "Transportation": 1.2,
-                "Food": 1.0,
-                "Energy": 1.3,
-                "Waste": 0.8,
-                "Shopping": 0.9,
-                "Lifestyle": 0.7,
-            }
-
-            # Eco points formula: base points minus emission penalty, plus category bonus
-            base_points = 100
-            emission_penalty = carbon_emission * 2
-            category_bonus = category_multipliers[category] * 10
-            eco_points = max(0, base_points - emission_penalty + category_bonus)
-
-            data.append(
-                {
-                    "activity": activity,
-                    "category": category,
-                    "carbon_emission": round(carbon_emission, 2),
-                    "eco_points": round(eco_points, 1),
-                }
-            )
-
-        return pd.DataFrame(data)
-
-    def train_model(self, n_samples: int = 500):
-        """Train the AI model using 80/20 split"""
         # Generate training data
+        progress("generating data", 0.1)
         df = self.generate_training_data(n_samples)
 
         # Prepare features
-        self.encoder = LabelEncoder()
-        df["category_encoded"] = self.encoder.fit_transform(df["category"])
+        encoder = LabelEncoder()
+        df["category_encoded"] = encoder.fit_transform(df["category"])
 
         # Create activity type features (simplified NLP)
         df["activity_length"] = df["activity"].str.len()
         df["has_sustainable"] = df["activity"].str.contains(
-            "solar|electric|cycling|walking|recycling|compost|local|second-hand|plant-based",
+            "|".join(SUSTAINABLE_KEYWORDS),
             case=False,
         ).astype(int)
 
         # Features for training
         features = ["carbon_emission", "category_encoded", "activity_length", "has_sustainable"]
-        X = df[features]
-        y = df["eco_points"]
+        X = df[features].to_numpy(dtype=float)
+        y = df["eco_points"].to_numpy(dtype=float)
+
+        return self._fit_and_publish(X, y, encoder, n_jobs, progress)
+
+    def train_model_from_activities(self, db, since=None, until=None, sample_rate: Optional[float] = None,
+                                    chunk_size: int = 5000, n_jobs: Optional[int] = None,
+                                    progress: Optional[Callable[[str, float], None]] = None):
+        """Train on logged Activity rows instead of synthetic data.
+
+        Rows are streamed from the database in chunks and reduced to the compact feature
+        matrix as they arrive, so the table is never loaded into a DataFrame or the ORM.
+        See ``iter_activity_chunks`` for the ``since``/``until``/``sample_rate`` filters.
+        """
+        from sklearn.preprocessing import LabelEncoder
+        from app.services.training_data import iter_activity_chunks
+
+        progress = progress or (lambda stage, fraction: None)
+        progress("reading activities", 0.1)
+
+        # Categories get provisional codes in order of appearance, remapped to the
+        # LabelEncoder's sorted order once every category has been seen
+        codes = {}
+        feature_chunks, label_chunks = [], []
+        for chunk in iter_activity_chunks(db, since, until, sample_rate, chunk_size):
+            category_codes = np.array([codes.setdefault(c, len(codes)) for c in chunk["category"]])
+            feature_chunks.append(
+                self._build_features(chunk["activity"], category_codes, chunk["carbon_emission"])
+            )
+            label_chunks.append(chunk["eco_points"])
+
+        n_rows = sum(len(labels) for labels in label_chunks)
+        if n_rows < 10:
+            raise ValueError(f"Need at least 10 labelled activities to train, found {n_rows}")
+
+        X = np.concatenate(feature_chunks)
+        y = np.concatenate(label_chunks)
+        del feature_chunks, label_chunks
+
+        encoder = LabelEncoder().fit(list(codes))
+        remap = np.empty(len(codes), dtype=float)
+        remap[list(codes.values())] = encoder.transform(list(codes))
+        X[:, 1] = remap[X[:, 1].astype(int)]
+
+        return self._fit_and_publish(X, y, encoder, n_jobs, progress)
+
+    def _fit_and_publish(self, X: np.ndarray, y: np.ndarray, encoder, n_jobs: Optional[int],
+                         progress: Callable[[str, float], None]) -> dict:
+        """Split 80/20, scale, fit and evaluate the forest, then save and swap it in"""
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.metrics import mean_squared_error, r2_score
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
 
         # Split data 80/20
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
         # Scale features
-        self.scaler = StandardScaler()
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
+        scaler = StandardScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
+        X_test_scaled = scaler.transform(X_test)
 
         # Train model
-        self.model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.model.fit(X_train_scaled, y_train)
+        progress("fitting", 0.3)
+        model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs)
+        model.fit(X_train_scaled, y_train)
 
         # Evaluate model
-        y_pred = self.model.predict(X_test_scaled)
+        progress("evaluating", 0.8)
+        y_pred = model.predict(X_test_scaled)
         mse = mean_squared_error(y_test, y_pred)
         r2 = r2_score(y_test, y_pred)
 
@@ -203,114 +364,458 @@ class AIService:
         print(f"R² Score: {r2:.2f}")
 
         # Save model and preprocessing objects
+        progress("saving", 0.9)
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-        joblib.dump(self.model, self.model_path)
-        joblib.dump(self.encoder, self.encoder_path)
-        joblib.dump(self.scaler, self.scaler_path)
+        _dump_atomic(model, self.model_path)
+        _dump_atomic(encoder, self.encoder_path)
+        _dump_atomic(scaler, self.scaler_path)
 
-        self.is_trained = True
-        return {"mse": mse, "r2_score": r2}
+        metrics = {"mse": mse, "r2_score": r2}
+        artifact = ModelArtifact.from_fitted(model, encoder, scaler, metrics)
+        self.registry.publish(artifact, metrics)
+        self._set_artifact(artifact)
+        return metrics
 
     def load_model(self):
-        """Load trained model if it exists"""
+        """Load the current model version if one exists.
+
+        Serving uses the memory-mapped artifact of the registry's current version, so all
+        workers share one copy of the forest. If the registry is empty (or its current
+        version cannot be loaded), the pickles are compiled and published as a new version.
+        """
+        version = self.registry.current_version()
+        if version:
+            try:
+                self._set_artifact(self.registry.load(version))
+                return True
+            except (RegistryError, ArtifactVersionError, OSError) as e:
+                logger.warning(f"Could not load model version {version}: {e}; re-publishing from pickles")
+
         if os.path.exists(self.model_path):
-            self.model = joblib.load(self.model_path)
-            self.encoder = joblib.load(self.encoder_path)
-            self.scaler = joblib.load(self.scaler_path)
-            self.is_trained = True
+            import joblib
+
+            artifact = ModelArtifact.from_fitted(
+                joblib.load(self.model_path),
+                joblib.load(self.encoder_path),
+                joblib.load(self.scaler_path),
+            )
+            try:
+                artifact = self.registry.load(self.registry.publish(artifact))
+            except (RegistryError, OSError) as e:
+                # e.g. a concurrently starting worker pruned the version just published;
+                # serve the in-memory artifact rather than failing startup
+                logger.warning(f"Could not publish model to {self.registry_dir}: {e}")
+            self._set_artifact(artifact)
             return True
         return False
 
+    @property
+    def registry(self) -> ModelRegistry:
+        return ModelRegistry(self.registry_dir)
+
+    def reload_model(self, version: str) -> bool:
+        """Load ``version`` from the registry and swap it in, unless it is already serving.
+
+        Loading happens on the caller's thread; requests keep using the old model until the
+        single swap in _set_artifact.
+        """
+        if version == self.model_version:
+            return False
+        try:
+            self._set_artifact(self.registry.load(version))
+        except (RegistryError, ArtifactVersionError, OSError) as e:
+            logger.error(f"Could not load model version {version}: {e}")
+            return False
+        logger.info(f"Swapped in model version {version}")
+        return True
+
+    def start_watcher(self, interval: float):
+        """Pick up versions published by other processes (training jobs, other workers)"""
+        if self.watcher is None:
+            self.watcher = RegistryWatcher(self.registry, self.reload_model, interval)
+            self.watcher.start()
+
+    def _set_artifact(self, artifact: ModelArtifact):
+        """Swap in a new model and drop predictions made by the previous one"""
+        self.artifact = artifact
+        self.model_version = artifact.metadata.get("version")
+        self.model_generation += 1
+        self.is_trained = True
+        if self.prediction_cache is not None:
+            self.prediction_cache.clear()
+
     def predict_eco_points(self, activity: str, category: str, carbon_emission: float) -> float:
-        """Predict eco points for a given activity"""
+        """Predict eco points for a given activity.
+
+        Calls from worker threads (sync routes) are coalesced with concurrent calls by the
+        micro-batch dispatcher. Calls made on the event loop thread run inline, since
+        blocking the loop while waiting for a batch would stall every other request.
+        """
+        if self.dispatcher is not None and not _on_event_loop():
+            # Answer cache hits here so they never wait for the batching window
+            if self.prediction_cache is not None:
+                cached = self.prediction_cache.get(self._cache_key(activity, category, carbon_emission))
+                if cached is not None:
+                    return cached
+            try:
+                future = self.dispatcher.submit((activity, category, carbon_emission))
+                return future.result(timeout=settings.PREDICT_BATCH_TIMEOUT_SECONDS)
+            except (RuntimeError, FuturesTimeoutError) as e:
+                # Dispatcher closed (shutdown) or stuck: answer this call on its own
+                logger.warning(f"Batched prediction unavailable, predicting inline: {e}")
+        return self.predict_eco_points_batch([activity], [category], [carbon_emission])[0]
+
+    def predict_eco_points_batch(
+        self,
+        activities: Sequence[str],
+        categories: Sequence[str],
+        carbon_emissions: Sequence[float],
+        lookup_cache: bool = True,
+    ) -> List[float]:
+        """Predict eco points for many activities with a single model call.
+
+        Rows whose category was not seen during training use the fallback formula. Rows
+        already in the prediction cache are not sent to the model at all; pass
+        ``lookup_cache=False`` when the caller has already checked the cache.
+        """
+        activities = np.asarray(activities, dtype=str)
+        categories = np.asarray(categories, dtype=str)
+        carbon_emissions = self._quantize_emissions(np.asarray(carbon_emissions, dtype=float))
+        if not (len(activities) == len(categories) == len(carbon_emissions)):
+            raise ValueError("activities, categories and carbon_emissions must have the same length")
+        if len(activities) == 0:
+            return []
+
+        if self.prediction_cache is None:
+            return self._predict_uncached(activities, categories, carbon_emissions).tolist()
+
+        keys = [self._cache_key(a, c, e) for a, c, e in zip(activities, categories, carbon_emissions)]
+        if lookup_cache:
+            results = [self.prediction_cache.get(key) for key in keys]
+        else:
+            results = [None] * len(keys)
+        missing = np.array([result is None for result in results])
+        if missing.any():
+            computed = self._predict_uncached(activities[missing], categories[missing], carbon_emissions[missing])
+            for index, value in zip(np.flatnonzero(missing), computed.tolist()):
+                results[index] = value
+                self.prediction_cache.set(keys[index], value)
+        return results
+
+    def _predict_uncached(self, activities: np.ndarray, categories: np.ndarray,
+                          carbon_emissions: np.ndarray) -> np.ndarray:
         if not self.is_trained and not self.load_model():
             # Fallback to simple calculation if model not trained
-            return self._fallback_prediction(activity, category, carbon_emission)
+            return self._fallback_prediction_batch(activities, categories, carbon_emissions)
+
+        artifact = self.artifact
+        category_encoded, known = self._encode_categories(artifact.categories, categories)
+        predictions = np.empty(len(activities), dtype=float)
 
-        # Prepare input features
-        category_encoded = self.encoder.transform([category])[0]
-        activity_length = len(activity)
-        has_sustainable = 1 if "solar" in activity.lower() or "electric" in activity.lower() or "cycling" in activity.lower() or "walking" in activity.lower() or "recycling" in activity.lower() or "compost" in activity.lower() or "local" in activity.lower() or "second-hand" in activity.lower() or "plant-based" in activity.lower() else 0
+        if known.any():
+            features = self._build_features(activities[known], category_encoded[known], carbon_emissions[known])
+            features_scaled = (features - artifact.feature_mean) / artifact.feature_scale
+            predictions[known] = np.round(np.maximum(artifact.forest.predict(features_scaled), 0), 1)
 
-        features = np.array([[carbon_emission, category_encoded, activity_length, has_sustainable]])
-        features_scaled = self.scaler.transform(features)
+        if not known.all():
+            unknown = ~known
+            predictions[unknown] = self._fallback_prediction_batch(
+                activities[unknown], categories[unknown], carbon_emissions[unknown]
+            )
 
-        prediction = self.model.predict(features_scaled)[0]
-        return round(max(0, prediction), 1)
+        return predictions
+
+    def _quantize_emissions(self, carbon_emissions):
+        step = settings.PREDICT_CACHE_EMISSION_STEP
+        if step > 0:
+            return np.round(carbon_emissions / step) * step
+        return carbon_emissions
+
+    def _cache_key(self, activity: str, category: str, carbon_emission: float) -> tuple:
+        # Lower-casing keeps both model features (length, keyword match) unchanged
+        return (
+            self.model_generation,
+            str(activity).lower(),
+            str(category),
+            float(self._quantize_emissions(float(carbon_emission))),
+        )
+
+    @staticmethod
+    def _encode_categories(classes: np.ndarray, categories: np.ndarray):
+        """Vectorized LabelEncoder.transform that flags unseen categories instead of raising"""
+        positions = np.searchsorted(classes, categories)
+        positions = np.minimum(positions, len(classes) - 1)
+        known = classes[positions] == categories
+        return positions, known
+
+    @staticmethod
+    def _sustainable_mask(activities: np.ndarray) -> np.ndarray:
+        lowered = np.char.lower(activities)
+        mask = np.zeros(len(activities), dtype=bool)
+        for keyword in SUSTAINABLE_KEYWORDS:
+            mask |= np.char.find(lowered, keyword) >= 0
+        return mask
+
+    def _build_features(self, activities: np.ndarray, category_encoded: np.ndarray,
+                        carbon_emissions: np.ndarray) -> np.ndarray:
+        """Build the (n, 4) feature matrix used by the model in one pass"""
+        return np.column_stack(
+            [
+                carbon_emissions,
+                category_encoded,
+                np.char.str_len(activities),
+                self._sustainable_mask(activities),
+            ]
+        ).astype(float)
 
     def _fallback_prediction(self, activity: str, category: str, carbon_emission: float) -> float:
         """Fallback prediction when model is not available"""
         base_points = 100
         emission_penalty = carbon_emission * 2
 
-        category_multipliers = {
-            "Transportation": 1.2,
-            "Food": 1.0,
-            "Energy": 1.3,
-            "Waste": 0.8,
-            "Shopping": 0.9,
-            "Lifestyle": 0.7,
-        }
-
-        category_bonus = category_multipliers.get(category, 1.0) * 10
-        sustainable_bonus = 10 if any(word in activity.lower() for word in ["solar", "electric", "cycling", "walking", "recycling", "compost", "local", "second-hand", "plant-based"]) else 0
+        category_bonus = CATEGORY_MULTIPLIERS.get(category, 1.0) * 10
+        sustainable_bonus = 10 if any(word in activity.lower() for word in SUSTAINABLE_KEYWORDS) else 0
 
         return max(0, base_points - emission_penalty + category_bonus + sustainable_bonus)
 
-    async def generate_response(self, message: str, activity: str = None, category: str = None, 
-                              carbon_emission: float = None, eco_points: float = None) -> str:
-        """Generate eco-related responses using OpenAI GPT for natural, conversational responses"""
-        if not openai:
+    def _fallback_prediction_batch(self, activities: np.ndarray, categories: np.ndarray,
+                                   carbon_emissions: np.ndarray) -> np.ndarray:
+        """Vectorized version of _fallback_prediction"""
+        category_bonus = np.array([CATEGORY_MULTIPLIERS.get(c, 1.0) for c in categories]) * 10
+        sustainable_bonus = np.where(self._sustainable_mask(activities), 10.0, 0.0)
+        return np.maximum(0.0, 100 - carbon_emissions * 2 + category_bonus + sustainable_bonus)
+
+    async def generate_response(self, message: str, activity: str = None, category: str = None,
+                              carbon_emission: float = None, eco_points: float = None,
+                              template: Optional[str] = None, priority: int = INTERACTIVE) -> str:
+        """Generate eco-related responses using OpenAI GPT for natural, conversational responses.
+
+        Callers that build ``message`` from a fixed template pass its name as ``template``;
+        those responses are cached on the template, activity, category and the bucketed
+        emission/points, so repeated inputs skip the LLM round trip. Fallback responses
+        are never cached. Concurrent identical requests share a single completion call.
+        Calls wait for an LLM bulkhead slot in the ``priority`` lane and fall back when
+        the queue is full.
+        """
+        key = self._advice_cache_key(template, activity, category, carbon_emission, eco_points)
+        if key is not None:
+            cached = self.advice_cache.get(key)
+            if cached is not None:
+                return cached
+
+        flight_key = key or (" ".join(message.lower().split()), activity, category, carbon_emission, eco_points)
+        response = await self.completions_in_flight.do(
+            flight_key,
+            lambda: self._request_completion(message, activity, category, carbon_emission, eco_points, priority),
+        )
+        if response is None:
             return self._generate_fallback_response(category)
+        if key is not None:
+            self.advice_cache.set(key, response)
+        return response
+
+    async def _request_completion(self, message: str, activity: Optional[str], category: Optional[str],
+                                  carbon_emission: Optional[float], eco_points: Optional[float],
+                                  priority: int = INTERACTIVE) -> Optional[str]:
+        """Ask the LLM for a response; None when it is unavailable, saturated or the call fails"""
+        client = self.open_openai_client()
+        if client is None:
+            return None
+        # Checked before queueing for a slot, so an open circuit falls back at once
+        if not self.llm_breaker.allow():
+            logger.warning(f"LLM call shed: {self.llm_breaker.name} circuit is open")
+            return None
 
         try:
-            if not settings.OPENAI_API_KEY:
-                logger.warning("OpenAI API key not configured")
-                return self._generate_fallback_response(category)
-                
-            openai.api_key = settings.OPENAI_API_KEY
-
-            # Build context based on available information
-            context = ""
-            if activity and category and carbon_emission is not None and eco_points is not None:
-                context = f"The user performed an activity: '{activity}' in category '{category}' with estimated {carbon_emission}kg CO2 emissions. They earned {eco_points} eco-points for this activity."
-
-            prompt = f"""
-            You are an eco-friendly AI assistant helping users with environmental questions and activities.
-            {context}
-
-            User's message: "{message}"
-
-            Provide a friendly, conversational response that:
-            1. Addresses the user's question or comment about environmental topics
-            2. If activity details are provided, acknowledges their activity and eco-points earned
-            3. Gives helpful, accurate information about environmental impact, sustainability, or eco-friendly practices
-            4. Suggests specific, actionable steps when relevant
-            5. Encourages positive environmental behavior
-            6. Keep the response natural and engaging, like a helpful friend
-
-            Response should be 2-4 sentences long and end on a positive, motivating note.
-            Only respond to eco-related topics; if the question is not eco-related, politely redirect to environmental topics.
-            """
-
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are a helpful eco-assistant providing information and advice on environmental topics."},
-                        {"role": "user", "content": prompt},
-                    ],
-                    max_tokens=200,
-                    temperature=0.7,
-                )
-            )
+            async with self.llm_bulkhead.slot(priority, settings.LLM_QUEUE_TIMEOUT_SECONDS or None):
+                async with self.llm_breaker.record():
+                    response = await client.chat.completions.create(
+                        model="gpt-3.5-turbo",
+                        messages=self._build_messages(message, activity, category, carbon_emission, eco_points),
+                        max_tokens=200,
+                        temperature=0.7,
+                    )
 
             return response.choices[0].message.content.strip()
 
+        except BulkheadFull as e:
+            logger.warning(f"LLM call shed: {e}")
+            return None
         except Exception as e:
             logger.error(f"Error generating AI response: {e}")
-            return self._generate_fallback_response(category)
+            return None
+
+    def _build_messages(self, message: str, activity: Optional[str], category: Optional[str],
+                        carbon_emission: Optional[float], eco_points: Optional[float]) -> List[dict]:
+        # Build context based on available information
+        context = ""
+        if activity and category and carbon_emission is not None and eco_points is not None:
+            context = f"The user performed an activity: '{activity}' in category '{category}' with estimated {carbon_emission}kg CO2 emissions. They earned {eco_points} eco-points for this activity."
+
+        prompt = f"""
+        You are an eco-friendly AI assistant helping users with environmental questions and activities.
+        {context}
+
+        User's message: "{message}"
+
+        Provide a friendly, conversational response that:
+        1. Addresses the user's question or comment about environmental topics
+        2. If activity details are provided, acknowledges their activity and eco-points earned
+        3. Gives helpful, accurate information about environmental impact, sustainability, or eco-friendly practices
+        4. Suggests specific, actionable steps when relevant
+        5. Encourages positive environmental behavior
+        6. Keep the response natural and engaging, like a helpful friend
+
+        Response should be 2-4 sentences long and end on a positive, motivating note.
+        Only respond to eco-related topics; if the question is not eco-related, politely redirect to environmental topics.
+        """
+
+        return [
+            {"role": "system", "content": "You are a helpful eco-assistant providing information and advice on environmental topics."},
+            {"role": "user", "content": prompt},
+        ]
+
+    async def stream_response(self, message: str, activity: str = None, category: str = None,
+                              carbon_emission: float = None, eco_points: float = None) -> AsyncIterator[str]:
+        """Yield the response text as the provider streams it.
+
+        When the provider is unavailable, or fails before sending any text, the fallback
+        response is yielded as a single piece. Closing the generator (e.g. when the client
+        disconnects) closes the upstream stream so no further tokens are generated.
+        """
+        client = self.open_openai_client()
+        if client is None:
+            yield self._generate_fallback_response(category)
+            return
+        if not self.llm_breaker.allow():
+            logger.warning(f"LLM stream shed: {self.llm_breaker.name} circuit is open")
+            yield self._generate_fallback_response(category)
+            return
+
+        try:
+            await self.llm_bulkhead.acquire(INTERACTIVE, settings.LLM_QUEUE_TIMEOUT_SECONDS or None)
+        except BulkheadFull as e:
+            logger.warning(f"LLM stream shed: {e}")
+            yield self._generate_fallback_response(category)
+            return
+
+        # One breaker outcome per stream, recorded once it has finished or failed
+        started = time.monotonic()
+        failed = finished = sent_text = False
+        try:
+            try:
+                stream = await client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=self._build_messages(message, activity, category, carbon_emission, eco_points),
+                    max_tokens=200,
+                    temperature=0.7,
+                    stream=True,
+                )
+            except Exception as e:
+                logger.error(f"Error starting AI response stream: {e}")
+                failed = True
+                yield self._generate_fallback_response(category)
+                return
+
+            try:
+                async for chunk in stream:
+                    text = chunk.choices[0].delta.content if chunk.choices else None
+                    if text:
+                        sent_text = True
+                        yield text
+                finished = True
+            except Exception as e:
+                logger.error(f"Error streaming AI response: {e}")
+                failed = True
+                if not sent_text:
+                    yield self._generate_fallback_response(category)
+            finally:
+                await stream.close()
+        finally:
+            self.llm_bulkhead.release()
+            if failed:
+                self.llm_breaker.record_failure()
+            elif finished or sent_text:
+                # A client that disconnects mid-stream still saw the provider working
+                self.llm_breaker.record_success(time.monotonic() - started)
+
+    def _advice_cache_key(self, template: Optional[str], activity: Optional[str], category: Optional[str],
+                          carbon_emission: Optional[float], eco_points: Optional[float]) -> Optional[tuple]:
+        if template is None or self.advice_cache is None:
+            return None
+
+        def bucket(value, step):
+            if value is None:
+                return None
+            return round(round(float(value) / step) * step, 6) if step > 0 else float(value)
+
+        return (
+            template,
+            str(activity).strip().lower() if activity is not None else None,
+            category,
+            bucket(carbon_emission, settings.ADVICE_CACHE_EMISSION_STEP),
+            bucket(eco_points, settings.ADVICE_CACHE_POINTS_STEP),
+        )
+
+    def open_openai_client(self):
+        """Return the shared AsyncOpenAI client, creating it on first use.
+
+        Requests are plain coroutines on one pooled HTTP client, so concurrent chats reuse
+        keep-alive connections instead of each holding an executor thread. Returns None
+        when the openai package or the API key is missing.
+        """
+        if self.openai_client is not None:
+            return self.openai_client
+        if not openai:
+            return None
+        if not settings.OPENAI_API_KEY:
+            logger.warning("OpenAI API key not configured")
+            return None
+
+        import httpx
+
+        http_client = openai.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(settings.OPENAI_TIMEOUT_SECONDS, connect=settings.OPENAI_CONNECT_TIMEOUT_SECONDS),
+        )
+        self.openai_client = openai.AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=http_client,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+        )
+        return self.openai_client
+
+    async def close_openai_client(self):
+        """Close the shared OpenAI client and its connection pool"""
+        client, self.openai_client = self.openai_client, None
+        if client is not None:
+            await client.close()
+
+    def stats(self) -> dict:
+        """Counters for the monitoring endpoint"""
+        return {
+            "model_loaded": self.is_trained,
+            "model_version": self.model_version,
+            "model_generation": self.model_generation,
+            "prediction_cache": self.prediction_cache.stats() if self.prediction_cache is not None else None,
+            "batching": self.dispatcher.stats() if self.dispatcher is not None else None,
+            "advice_cache": self.advice_cache.stats() if self.advice_cache is not None else None,
+            "completions_in_flight": self.completions_in_flight.stats(),
+            "llm_bulkhead": self.llm_bulkhead.stats(),
+            "llm_circuit": self.llm_breaker.stats(),
+        }
+
+    def close(self):
+        """Release background resources (called on application shutdown)"""
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        if self.dispatcher is not None:
+            self.dispatcher.close()
 
     def _generate_fallback_response(self, category: Optional[str] = None) -> str:
         if category and category in self.fallback_responses:
@@ -0,0 +1,132 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class MicroBatchDispatcher:
+    """Collect concurrent single-item calls and run them through one batch call.
+
+    Callers in different threads ``submit`` an item and block on the returned
+    future. A background thread waits up to ``window_ms`` after the first
+    pending item (or until ``max_batch_size`` items are queued), then hands the
+    whole batch to ``batch_fn`` and resolves each caller's future with its own
+    result.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Sequence[Any]],
+        window_ms: float = 2.0,
+        max_batch_size: int = 64,
+        name: str = "micro-batch",
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.batch_fn = batch_fn
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+
+    def submit(self, item: Any) -> Future:
+        """Queue one item and return a future for its result"""
+        future: Future = Future()
+        # Checked and queued under the lock, so nothing can land behind close()'s _STOP
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} dispatcher is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._queue.put((item, future))
+        return future
+
+    def close(self, timeout: float = 1.0):
+        """Stop the worker thread after flushing anything already queued"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "window_ms": self.window * 1000.0,
+            "max_batch_size": self.max_batch_size,
+        }
+
+    def _run(self):
+        try:
+            self._serve()
+        finally:
+            self._fail_leftovers()
+
+    def _serve(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            pending = [first]
+            stop = False
+            deadline = time.monotonic() + self.window
+            while len(pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stop = True
+                    break
+                pending.append(entry)
+
+            self._dispatch(pending)
+            if stop:
+                return
+
+    def _fail_leftovers(self):
+        # Anything still queued once the worker exits would otherwise never resolve
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if entry is not _STOP:
+                entry[1].set_exception(RuntimeError(f"{self.name} dispatcher is closed"))
+
+    def _dispatch(self, pending):
+        futures = [future for _, future in pending]
+        try:
+            results = self.batch_fn([item for item, _ in pending])
+            if len(results) != len(pending):
+                raise RuntimeError(f"{self.name}: batch_fn returned {len(results)} results for {len(pending)} items")
+        except Exception as e:
+            logger.error(f"{self.name}: batch of {len(pending)} failed: {e}")
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.items += len(pending)
+        for future, result in zip(futures, results):
+            future.set_result(result)
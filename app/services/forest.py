@@ -0,0 +1,84 @@
+import numpy as np
+
+
+class CompiledForest:
+    """A fitted tree-ensemble regressor flattened into contiguous NumPy arrays.
+
+    Every node of every tree lives in one set of parallel arrays (``feature``,
+    ``threshold``, ``value``); ``children[2 * node + go_left]`` is the next node and
+    ``roots`` holds the index of each tree's root node. Leaves point to themselves,
+    so evaluation is a fixed number of vectorized steps (the depth of the deepest
+    tree) over all rows and trees at once, with no per-call estimator validation or
+    Python-level dispatch per tree. The arrays are exactly what ``predict`` reads,
+    with native-width indices, so a memory-mapped forest needs no private copies.
+    """
+
+    ARRAY_NAMES = ("feature", "threshold", "children", "value", "roots")
+
+    def __init__(self, feature, threshold, children, value, roots, max_depth: int):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+
+    @classmethod
+    def from_sklearn(cls, model) -> "CompiledForest":
+        """Flatten a fitted RandomForestRegressor (or any single-output tree ensemble)"""
+        estimators = getattr(model, "estimators_", None) or [model]
+        trees = [estimator.tree_ for estimator in estimators]
+        if any(tree.value.shape[1] != 1 for tree in trees):
+            raise ValueError("Only single-output regressors can be compiled")
+
+        sizes = np.array([tree.node_count for tree in trees])
+        roots = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.intp)
+        n_nodes = int(sizes.sum())
+
+        feature = np.empty(n_nodes, dtype=np.intp)
+        threshold = np.empty(n_nodes, dtype=np.float64)
+        # children[2 * node] is the right child, children[2 * node + 1] the left one
+        children = np.empty((n_nodes, 2), dtype=np.intp)
+        value = np.empty(n_nodes, dtype=np.float64)
+
+        for tree, offset in zip(trees, roots):
+            nodes = slice(offset, offset + tree.node_count)
+            own_index = np.arange(offset, offset + tree.node_count, dtype=np.intp)
+            is_leaf = tree.children_left == -1
+
+            feature[nodes] = np.where(is_leaf, 0, tree.feature)
+            threshold[nodes] = np.where(is_leaf, 0.0, tree.threshold)
+            children[nodes, 0] = np.where(is_leaf, own_index, tree.children_right + offset)
+            children[nodes, 1] = np.where(is_leaf, own_index, tree.children_left + offset)
+            value[nodes] = tree.value[:, 0, 0]
+
+        max_depth = max(tree.max_depth for tree in trees)
+        return cls(feature, threshold, children.ravel(), value, roots, max_depth)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.arrays().values())
+
+    def arrays(self) -> dict:
+        return {name: getattr(self, name) for name in self.ARRAY_NAMES}
+
+    def predict(self, X) -> np.ndarray:
+        """Average of the per-tree leaf values for each row of X"""
+        # sklearn evaluates trees on float32 inputs; match it so splits agree exactly
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2:
+            raise ValueError("X must be a 2D array")
+
+        n_rows, n_features = X.shape
+        flat_X = X.astype(np.float64).ravel()
+        row_offset = (np.arange(n_rows) * n_features)[:, None]
+        node = np.broadcast_to(self.roots, (n_rows, self.n_trees))
+        for _ in range(self.max_depth):
+            go_left = flat_X[row_offset + self.feature[node]] <= self.threshold[node]
+            node = self.children[2 * node + go_left]
+
+        return self.value[node].sum(axis=1) / self.n_trees
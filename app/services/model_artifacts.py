@@ -0,0 +1,114 @@
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from app.services.forest import CompiledForest
+
+# Bump whenever the on-disk layout changes; load_artifact refuses anything else
+ARTIFACT_FORMAT_VERSION = 2
+META_FILE = "meta.json"
+
+
+class ArtifactVersionError(ValueError):
+    """Raised when an artifact was written with an unsupported format version"""
+
+
+class ModelArtifact:
+    """Everything needed to serve eco-points predictions, as plain NumPy arrays.
+
+    Holds the compiled forest, the category labels (in LabelEncoder order) and the
+    StandardScaler mean/scale. Loaded with ``mmap_mode='r'`` the arrays are backed by
+    the page cache, so every worker process maps the same physical pages.
+    """
+
+    def __init__(self, forest: CompiledForest, categories, feature_mean, feature_scale,
+                 metadata: Optional[dict] = None):
+        self.forest = forest
+        self.categories = categories
+        self.feature_mean = feature_mean
+        self.feature_scale = feature_scale
+        self.metadata = metadata or {}
+
+    @classmethod
+    def from_fitted(cls, model, encoder, scaler, metadata: Optional[dict] = None) -> "ModelArtifact":
+        """Build an artifact from a fitted forest, LabelEncoder and StandardScaler"""
+        return cls(
+            CompiledForest.from_sklearn(model),
+            np.asarray(encoder.classes_, dtype=str),
+            np.asarray(scaler.mean_, dtype=np.float64),
+            np.asarray(scaler.scale_, dtype=np.float64),
+            metadata,
+        )
+
+    def arrays(self) -> dict:
+        arrays = {f"forest_{name}": array for name, array in self.forest.arrays().items()}
+        arrays["categories"] = self.categories
+        arrays["feature_mean"] = self.feature_mean
+        arrays["feature_scale"] = self.feature_scale
+        return arrays
+
+
+def save_artifact(artifact: ModelArtifact, directory: str):
+    """Write the artifact as one .npy file per array plus meta.json.
+
+    Files are written to a temporary sibling directory that is then renamed into place,
+    so readers never see a half-written artifact.
+    """
+    directory = os.path.normpath(directory)
+    tmp_dir = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    arrays = artifact.arrays()
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(array))
+
+    meta = {
+        **artifact.metadata,
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "max_depth": artifact.forest.max_depth,
+        "arrays": sorted(arrays),
+        "created_at": artifact.metadata.get("created_at") or datetime.utcnow().isoformat(),
+    }
+    with open(os.path.join(tmp_dir, META_FILE), "w") as f:
+        json.dump(meta, f, indent=2)
+
+    old_dir = f"{directory}.old-{os.getpid()}"
+    if os.path.exists(directory):
+        os.replace(directory, old_dir)
+    os.replace(tmp_dir, directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def read_artifact_meta(directory: str) -> dict:
+    with open(os.path.join(directory, META_FILE)) as f:
+        meta = json.load(f)
+    version = meta.get("format_version")
+    if version != ARTIFACT_FORMAT_VERSION:
+        raise ArtifactVersionError(
+            f"Model artifact in {directory} has format version {version}, expected {ARTIFACT_FORMAT_VERSION}"
+        )
+    return meta
+
+
+def load_artifact(directory: str, mmap: bool = True) -> ModelArtifact:
+    """Load an artifact written by save_artifact, memory-mapping its arrays by default"""
+    meta = read_artifact_meta(directory)
+    mmap_mode = "r" if mmap else None
+
+    def load(name):
+        return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+
+    forest = CompiledForest(
+        **{name: load(f"forest_{name}") for name in CompiledForest.ARRAY_NAMES},
+        max_depth=meta["max_depth"],
+    )
+    return ModelArtifact(forest, load("categories"), load("feature_mean"), load("feature_scale"), meta)
+
+
+def artifact_exists(directory: str) -> bool:
+    return os.path.exists(os.path.join(directory, META_FILE))
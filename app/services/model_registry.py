@@ -0,0 +1,181 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Optional
+
+from app.services.model_artifacts import ModelArtifact, load_artifact, save_artifact
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked manifest updates
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+
+
+class RegistryError(Exception):
+    """Raised when a registered model version is missing or fails its checksum"""
+
+
+def artifact_checksum(directory: str) -> str:
+    """sha256 over every array file (and its name) of an artifact directory"""
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".npy"):
+            continue
+        digest.update(name.encode())
+        with open(os.path.join(directory, name), "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """Immutable, versioned model artifacts under one directory.
+
+    Each version is an artifact directory ``<root>/<version>/``. ``manifest.json`` records
+    every version's metrics and checksum plus which version is current. Publishing writes
+    the new version first and then replaces the manifest atomically, so readers see either
+    the old or the new current version, never a partial one.
+    """
+
+    KEEP_VERSIONS = 5
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, MANIFEST_FILE)
+
+    def read_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"current": None, "versions": {}}
+
+    def current_version(self) -> Optional[str]:
+        return self.read_manifest().get("current")
+
+    def manifest_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def publish(self, artifact: ModelArtifact, metrics: Optional[dict] = None) -> str:
+        """Store ``artifact`` as a new version and make it current"""
+        os.makedirs(self.root, exist_ok=True)
+        version = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+        directory = os.path.join(self.root, version)
+        artifact.metadata = {**artifact.metadata, "version": version}
+        save_artifact(artifact, directory)
+        checksum = artifact_checksum(directory)
+
+        with self._locked():
+            manifest = self.read_manifest()
+            manifest["versions"][version] = {
+                "created_at": datetime.utcnow().isoformat(),
+                "metrics": {name: float(value) for name, value in (metrics or {}).items()},
+                "checksum": checksum,
+            }
+            manifest["current"] = version
+            self._prune(manifest)
+            self._write_manifest(manifest)
+
+        logger.info(f"Published model version {version}")
+        return version
+
+    def load(self, version: Optional[str] = None, mmap: bool = True) -> ModelArtifact:
+        """Load ``version`` (default: current), verifying its checksum"""
+        manifest = self.read_manifest()
+        version = version or manifest.get("current")
+        entry = manifest["versions"].get(version) if version else None
+        if not entry:
+            raise RegistryError(f"Model version {version!r} is not registered in {self.root}")
+
+        directory = os.path.join(self.root, version)
+        if artifact_checksum(directory) != entry["checksum"]:
+            raise RegistryError(f"Checksum mismatch for model version {version}")
+        artifact = load_artifact(directory, mmap=mmap)
+        artifact.metadata["version"] = version
+        return artifact
+
+    def _write_manifest(self, manifest: dict):
+        tmp_path = f"{self.manifest_path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _prune(self, manifest: dict):
+        # The manifest keeps versions in publish order; workers still mapping a removed
+        # version keep their open mappings until they swap
+        stale = list(manifest["versions"])[: -self.KEEP_VERSIONS]
+        for version in stale:
+            if version == manifest["current"]:
+                continue
+            del manifest["versions"][version]
+            shutil.rmtree(os.path.join(self.root, version), ignore_errors=True)
+
+    @contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.root, ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class RegistryWatcher:
+    """Poll the registry manifest and call ``on_change(version)`` when the current version moves"""
+
+    def __init__(self, registry: ModelRegistry, on_change: Callable[[str], None], interval: float = 10.0):
+        self.registry = registry
+        self.on_change = on_change
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_mtime = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._last_mtime = self.registry.manifest_mtime()
+        self._thread = threading.Thread(target=self._run, name="model-registry-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def check(self):
+        """Run one poll; called by the background thread"""
+        mtime = self.registry.manifest_mtime()
+        if mtime is None or mtime == self._last_mtime:
+            return
+        self._last_mtime = mtime
+        version = self.registry.current_version()
+        if version:
+            self.on_change(version)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Model registry watcher failed: {e}")
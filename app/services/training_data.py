@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Iterator, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def iter_activity_chunks(
+    db: Session,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    sample_rate: Optional[float] = None,
+    chunk_size: int = 5000,
+    seed: int = 42,
+) -> Iterator[dict]:
+    """Stream labelled Activity rows as column arrays, ``chunk_size`` rows at a time.
+
+    Only the four training columns are selected (no ORM objects are built) and the result
+    is fetched with ``yield_per``, which uses a server-side cursor on PostgreSQL, so memory
+    stays bounded by one chunk however large the table is. ``since``/``until`` restrict
+    ``created_at`` to ``[since, until)``; ``sample_rate`` keeps a random fraction of rows.
+    """
+    if sample_rate is not None and not 0 < sample_rate <= 1:
+        raise ValueError("sample_rate must be in (0, 1]")
+
+    stmt = select(
+        models.Activity.name,
+        models.Activity.category,
+        models.Activity.carbon_output,
+        models.Activity.eco_points,
+    ).where(
+        models.Activity.name.isnot(None),
+        models.Activity.category.isnot(None),
+        models.Activity.eco_points.isnot(None),
+        models.Activity.is_archived.isnot(True),
+    )
+    if since is not None:
+        stmt = stmt.where(models.Activity.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(models.Activity.created_at < until)
+
+    rng = np.random.default_rng(seed)
+    result = db.execute(stmt.execution_options(yield_per=chunk_size))
+    for rows in result.partitions():
+        if sample_rate is not None and sample_rate < 1:
+            keep = rng.random(len(rows)) < sample_rate
+            rows = [row for row, kept in zip(rows, keep) if kept]
+        if not rows:
+            continue
+        names, categories, carbon_output, eco_points = zip(*rows)
+        yield {
+            "activity": np.asarray(names, dtype=str),
+            "category": np.asarray(categories, dtype=str),
+            "carbon_emission": np.asarray(carbon_output, dtype=float),
+            "eco_points": np.asarray(eco_points, dtype=float),
+        }
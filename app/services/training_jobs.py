@@ -0,0 +1,183 @@
+import logging
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Optional
+
+from app.core.settings import settings
+from app.services.ai_service import AIService, ai_service
+
+logger = logging.getLogger(__name__)
+
+# Set in each pool process by _init_worker; progress updates travel back to the server through it
+_progress_queue = None
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _run_training_job(job_id: str, n_samples: Optional[int], n_jobs: Optional[int], paths: dict,
+                      source: str = "synthetic", options: Optional[dict] = None) -> dict:
+    """Runs in a pool process: train a fresh AIService and write its artifacts to ``paths``"""
+    service = AIService()
+    for name, value in paths.items():
+        setattr(service, name, value)
+
+    def report(stage: str, fraction: float):
+        if _progress_queue is not None:
+            _progress_queue.put((job_id, stage, fraction))
+
+    if source == "activities":
+        # The worker opens its own session; connections cannot cross process boundaries
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            metrics = service.train_model_from_activities(db, n_jobs=n_jobs, progress=report, **(options or {}))
+        finally:
+            db.close()
+    else:
+        metrics = service.train_model(n_samples, n_jobs=n_jobs, progress=report)
+    service.close()
+    return {name: float(value) for name, value in metrics.items()}
+
+
+class TrainingQueueFull(RuntimeError):
+    """Raised by submit() while every training slot already has a queued or running job"""
+
+
+class TrainingJobManager:
+    """Run model training in a separate process and swap the result into a live AIService.
+
+    Training never holds a request thread or touches the serving model while it runs.
+    The worker publishes a new registry version; once the job succeeds, the service loads
+    it, which replaces the whole (forest, categories, scaler) bundle in one assignment.
+    """
+
+    MAX_FINISHED_JOBS = 100
+
+    def __init__(self, service: AIService, max_workers: int = 1, max_active: Optional[int] = None):
+        self.service = service
+        self.max_workers = max_workers
+        # Jobs queued or running at once; further submissions are refused, not queued
+        self.max_active = max_active or max_workers
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._executor = None
+        self._progress_queue = None
+
+    def submit(self, n_samples: Optional[int], n_jobs: Optional[int] = None, source: str = "synthetic",
+               options: Optional[dict] = None) -> dict:
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "status": "queued",
+            "stage": "queued",
+            "progress": 0.0,
+            "source": source,
+            "n_samples": n_samples,
+            "n_jobs": n_jobs,
+            "submitted_at": datetime.utcnow().isoformat(),
+            "finished_at": None,
+            "metrics": None,
+            "error": None,
+        }
+        paths = {
+            "model_path": self.service.model_path,
+            "encoder_path": self.service.encoder_path,
+            "scaler_path": self.service.scaler_path,
+            "registry_dir": self.service.registry_dir,
+        }
+
+        args = (_run_training_job, job_id, n_samples, n_jobs, paths, source, options)
+
+        with self._lock:
+            active = sum(1 for existing in self._jobs.values() if not existing["finished_at"])
+            if active >= self.max_active:
+                raise TrainingQueueFull(f"{active} training job(s) already queued or running")
+            self._prune()
+            self._jobs[job_id] = job
+            try:
+                future = self._get_executor().submit(*args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); start a fresh pool for this and later jobs
+                self._executor = None
+                future = self._get_executor().submit(*args)
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+        return dict(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        self._drain_progress()
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: never fork a server process that is running threads
+            context = multiprocessing.get_context("spawn")
+            self._progress_queue = context.SimpleQueue()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self._progress_queue,),
+            )
+        return self._executor
+
+    def _drain_progress(self):
+        progress_queue = self._progress_queue
+        # Only one thread reads at a time, so empty() followed by get() cannot block
+        if progress_queue is None or not self._drain_lock.acquire(blocking=False):
+            return
+        try:
+            while not progress_queue.empty():
+                job_id, stage, fraction = progress_queue.get()
+                with self._lock:
+                    job = self._jobs.get(job_id)
+                    if job and job["status"] in ("queued", "running"):
+                        job.update(status="running", stage=stage, progress=fraction)
+        except (OSError, EOFError):
+            pass
+        finally:
+            self._drain_lock.release()
+
+    def _finish(self, job_id: str, future):
+        self._drain_progress()
+        update = {"finished_at": datetime.utcnow().isoformat()}
+        if future.cancelled():
+            update.update(status="cancelled", stage="cancelled")
+        elif future.exception() is not None:
+            logger.error(f"Training job {job_id} failed: {future.exception()}")
+            update.update(status="failed", stage="failed", error=str(future.exception()))
+        else:
+            try:
+                self.service.load_model()
+                update.update(status="completed", stage="completed", progress=1.0, metrics=future.result())
+            except Exception as e:
+                logger.error(f"Training job {job_id} finished but the model could not be loaded: {e}")
+                update.update(status="failed", stage="failed", error=str(e))
+
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(update)
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["finished_at"]]
+        for job_id in finished[: max(0, len(finished) - self.MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+
+training_jobs = TrainingJobManager(ai_service, max_workers=settings.TRAINING_MAX_WORKERS)
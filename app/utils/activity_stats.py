@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+class BucketedEmissions(NamedTuple):
+    emissions: List[float]  # per bucket, most recent first
+    counts: List[int]
+    total_emissions: float  # over all of the user's activities, bucketed or not
+    total_count: int
+
+
+def bucketed_emissions(
+    db: Session,
+    user_id: int,
+    width: timedelta,
+    n_buckets: int,
+    now: Optional[datetime] = None,
+    with_totals: bool = True,
+) -> BucketedEmissions:
+    """Emissions and activity counts in consecutive time buckets, in one aggregate query.
+
+    Bucket ``i`` covers ``[now - (i+1)*width, now - i*width)``. Activities older than the
+    last bucket, dated in the future or without a date are only part of the totals. The
+    bucket is a plain CASE over bound datetimes and the grouping happens in a subquery,
+    so the same SQL runs on SQLite and PostgreSQL and no ORM objects are loaded.
+
+    Callers that do not need the all-time totals pass ``with_totals=False``: the query
+    is then bounded to the bucketed window, which the ``(user_id, created_at)`` index
+    serves without reading the user's whole history, and the totals cover only the buckets.
+    """
+    now = now or datetime.utcnow()
+    created_at = models.Activity.created_at
+    outside = n_buckets
+    bucket = case(
+        (created_at >= now, outside),
+        *[(created_at >= now - width * (i + 1), i) for i in range(n_buckets)],
+        else_=outside,
+    )
+
+    rows = select(bucket.label("bucket"), models.Activity.carbon_output.label("carbon_output")).where(
+        models.Activity.user_id == user_id
+    )
+    if not with_totals:
+        rows = rows.where(created_at >= now - width * n_buckets, created_at < now)
+    rows = rows.subquery()
+    grouped = db.execute(
+        select(rows.c.bucket, func.sum(rows.c.carbon_output), func.count()).group_by(rows.c.bucket)
+    ).all()
+
+    emissions = [0.0] * n_buckets
+    counts = [0] * n_buckets
+    total_emissions, total_count = 0.0, 0
+    for index, bucket_emissions, bucket_count in grouped:
+        total_emissions += bucket_emissions or 0.0
+        total_count += bucket_count
+        if index < n_buckets:
+            emissions[index] = bucket_emissions or 0.0
+            counts[index] = bucket_count
+    return BucketedEmissions(emissions, counts, total_emissions, total_count)
+
+
+def month_range(year: int, month: int) -> Tuple[datetime, datetime]:
+    """Half-open ``[start, end)`` bounds of a calendar month"""
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
+
+def emissions_between(db: Session, user_id: int, start: datetime, end: datetime) -> Tuple[float, int]:
+    """Total emissions and activity count with ``start <= created_at < end``.
+
+    Plain range predicates on the raw column (not ``extract(...)``) let the
+    ``(user_id, created_at)`` index serve the query instead of scanning all the user's rows.
+    """
+    total_emissions, count = db.query(
+        func.sum(models.Activity.carbon_output),
+        func.count(models.Activity.id),
+    ).filter(
+        models.Activity.user_id == user_id,
+        models.Activity.created_at >= start,
+        models.Activity.created_at < end,
+    ).one()
+    return total_emissions or 0.0, count or 0
@@ -0,0 +1,64 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import func, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor for the position just after a row in (created_at, id) order"""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def keyset_page(
+    query,
+    created_at_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+) -> Tuple[List[Any], Optional[str]]:
+    """One page of ``query``, newest first, plus the cursor for the next page.
+
+    With a cursor the query seeks past it on ``(created_at, id)`` instead of counting
+    ``skip`` rows, so the cost of a page does not grow with its depth and rows inserted
+    meanwhile do not shift later pages. ``skip`` is only used when there is no cursor.
+    Rows without a ``created_at`` sort outside the seek and are never returned after
+    the first page. ``next_cursor`` is None once a page comes back short.
+
+    The seek compares against the cursor row's stored ``created_at`` (looked up by id
+    within ``query``'s own filters) rather than a bound datetime: SQLite stores datetimes
+    as text, and a bound value formatted differently from the stored one (e.g.
+    ``server_default=func.now()`` has no microseconds) would compare wrongly. The
+    cursor's own timestamp is only used if that row has since been deleted.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stored_created_at = query.with_entities(created_at_column).filter(id_column == row_id).scalar_subquery()
+        seek_from = func.coalesce(stored_created_at, created_at)
+        query = query.filter(tuple_(created_at_column, id_column) < tuple_(seek_from, row_id))
+    query = query.order_by(created_at_column.desc(), id_column.desc())
+    if not cursor and skip:
+        query = query.offset(skip)
+
+    rows = query.limit(limit).all()
+    next_cursor = None
+    if limit > 0 and len(rows) == limit:
+        last = rows[-1]
+        if getattr(last, created_at_column.key) is not None:
+            next_cursor = encode_cursor(getattr(last, created_at_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
@@ -1,6 +1,8 @@
-from app.database import Base, engine
-import app.models as models
+from alembic import command
+from alembic.config import Config
 
-print("Creating tables...")
-Base.metadata.create_all(bind=engine)
-print("Done. Tables created in SQLite DB.")
+# The schema is managed by alembic migrations (alembic/versions); this is the same as
+# running `alembic upgrade head` from the project root.
+print("Applying migrations...")
+command.upgrade(Config("alembic.ini"), "head")
+print("Done. Database is at the latest revision.")
@@ -0,0 +1,32 @@
+"""add (user_id, activity_date) index on logs
+
+Revision ID: 3e9a7c5d2b10
+Revises: 
+Create Date: 2026-10-17 10:00:00.000000
+
+First tracked revision: the tables themselves predate migrations, so this only
+adds the index behind the weekly insights and monthly summary range queries.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e9a7c5d2b10'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nothing to index until the app has created its tables
+    if 'logs' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_index('ix_logs_user_id_activity_date', 'logs', ['user_id', 'activity_date'],
+                    unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_logs_user_id_activity_date', table_name='logs', if_exists=True)
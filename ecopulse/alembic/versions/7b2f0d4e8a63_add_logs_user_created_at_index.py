@@ -0,0 +1,30 @@
+"""add (user_id, created_at) index on logs
+
+Revision ID: 7b2f0d4e8a63
+Revises: 3e9a7c5d2b10
+Create Date: 2026-10-17 10:30:00.000000
+
+Serves the newest-first log listing and its cursor seeks.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2f0d4e8a63'
+down_revision: Union[str, None] = '3e9a7c5d2b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if 'logs' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_index('ix_logs_user_id_created_at', 'logs', ['user_id', 'created_at'],
+                    unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_logs_user_id_created_at', table_name='logs', if_exists=True)
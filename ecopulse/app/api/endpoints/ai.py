@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, Body
+from fastapi import APIRouter, Depends, Body, HTTPException
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from ...services.ai_service import get_ai_response, calculate_emission_points
+from ...services.ai_service import get_ai_response, calculate_emission_points, calculate_emission_points_batch, get_ai_stats
 from ...api.dependencies import get_current_user
 
 router = APIRouter()
@@ -26,6 +26,20 @@ class CalculatePointsResponse(BaseModel):
     eco_points: int
     explanation: Optional[str] = None
 
+# Batch calculate points request/response models
+MAX_BATCH_CALCULATE_ITEMS = 50
+
+class CalculatePointsItem(BaseModel):
+    activity: str
+    category: str
+    details: Optional[str] = None
+
+class BatchCalculatePointsRequest(BaseModel):
+    items: List[CalculatePointsItem]
+
+class BatchCalculatePointsResponse(BaseModel):
+    results: List[CalculatePointsResponse]
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat_with_ai(
     chat_request: ChatRequest = Body(
@@ -106,6 +120,40 @@ async def calculate_points(
         explanation=result.get("explanation")
     )
 
+@router.post("/calculate-points/batch", response_model=BatchCalculatePointsResponse)
+async def calculate_points_batch(
+    request: BatchCalculatePointsRequest,
+    current_user = Depends(get_current_user)
+):
+    """
+    Calculate emissions and eco points for many activities in one AI round trip
+
+    Used when importing several activities at once. Results are returned in the
+    order of `items`; any item the AI cannot answer gets the fallback calculation.
+    """
+    if len(request.items) > MAX_BATCH_CALCULATE_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_CALCULATE_ITEMS} activities can be calculated per request"
+        )
+
+    results = await calculate_emission_points_batch([item.model_dump() for item in request.items])
+    return BatchCalculatePointsResponse(
+        results=[
+            CalculatePointsResponse(
+                carbon_emission=result["carbon_emission"],
+                eco_points=result["eco_points"],
+                explanation=result.get("explanation")
+            )
+            for result in results
+        ]
+    )
+
+@router.get("/stats")
+async def ai_stats():
+    """LLM concurrency counters: queue depth per lane, wait times and rejections"""
+    return get_ai_stats()
+
 # Add test endpoint to verify AI connection
 @router.get("/test-connection")
 async def test_ai_connection(current_user = Depends(get_current_user)):
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from sqlalchemy import func
 from datetime import datetime, timedelta
+from typing import Optional
 
 from ...core.database import get_db
 from ...models.user import User
@@ -66,19 +67,35 @@ def get_category_distribution(
 
 @router.get("/summary")
 def get_monthly_summary(
+    month: Optional[str] = Query(None, description="Month to summarize as YYYY-MM (default: current month)"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    current_month = datetime.utcnow().month
-    current_year = datetime.utcnow().year
+    if month:
+        try:
+            month_start = datetime.strptime(month, "%Y-%m")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="month must be formatted as YYYY-MM")
+    else:
+        month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    current_month = month_start.month
+    current_year = month_start.year
+    try:
+        if current_month == 12:
+            month_end = datetime(current_year + 1, 1, 1)
+        else:
+            month_end = datetime(current_year, current_month + 1, 1)
+    except ValueError:  # the month after 9999-12 is not a datetime
+        raise HTTPException(status_code=400, detail="month is out of range")
     
+    # Half-open [start, end) range on the raw column so the (user_id, activity_date) index is used
     monthly_data = db.query(
         func.sum(Log.emissions_saved).label('monthly_emissions'),
         func.count(Log.id).label('monthly_activities')
     ).filter(
         Log.user_id == current_user.id,
-        extract('month', Log.activity_date) == current_month,
-        extract('year', Log.activity_date) == current_year
+        Log.activity_date >= month_start,
+        Log.activity_date < month_end
     ).first()
     
     return {
@@ -86,4 +103,4 @@ def get_monthly_summary(
         "monthly_activities": monthly_data.monthly_activities or 0,
         "month": current_month,
         "year": current_year
-    }
\ No newline at end of file
+    }
@@ -1,26 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from ...core.database import get_db
 from ...models.user import User
 from ...models.log import Log
 from ...schemas.log import LogCreate, LogResponse, LogUpdate
 from ...api.dependencies import get_current_user
+from ...services.pagination import NEXT_CURSOR_HEADER, keyset_page
 
 router = APIRouter()
 
 @router.get("/", response_model=List[LogResponse])
 def get_user_logs(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description=f"Value of a previous page's {NEXT_CURSOR_HEADER} header"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all logs for the current user"""
+    """Get all logs for the current user, newest first.
+
+    Pass the ``X-Next-Cursor`` header of one page as ``cursor`` to fetch the next one;
+    ``skip`` still works but gets slower the deeper the page.
+    """
     try:
-        logs = db.query(Log).filter(Log.user_id == current_user.id).order_by(Log.created_at.desc()).offset(skip).limit(limit).all()
+        query = db.query(Log).filter(Log.user_id == current_user.id)
+        logs, next_cursor = keyset_page(query, Log.created_at, Log.id, limit, cursor=cursor, skip=skip)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         return logs
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     except Exception as e:
         print(f"Error fetching logs: {e}")
         raise HTTPException(
@@ -18,6 +18,31 @@ class Settings(BaseSettings):
 
     # AI Services
     OPENROUTER_API_KEY: Optional[str] = None
+    # Shared OpenRouter HTTP client: pool limits, keep-alive, HTTP/2 (needs h2) and timeouts
+    OPENROUTER_MAX_CONNECTIONS: int = 50
+    OPENROUTER_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENROUTER_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    OPENROUTER_HTTP2: bool = False
+    OPENROUTER_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    OPENROUTER_READ_TIMEOUT_SECONDS: float = 60.0
+    # Persistent cache of calculate-points results (shared by workers, survives restarts)
+    CALCULATION_CACHE_PATH: str = os.path.join(os.path.dirname(__file__), '..', '..', 'calculation_cache.db')
+    CALCULATION_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    CALCULATION_CACHE_FRONT_SIZE: int = 1024
+    # Longest a lookup waits on another worker's write lock before counting as a miss
+    CALCULATION_CACHE_BUSY_TIMEOUT_SECONDS: float = 0.1
+    # How often expired rows are deleted from the cache file (0 only purges at startup)
+    CALCULATION_CACHE_PURGE_INTERVAL_SECONDS: float = 6 * 3600
+    # Bulkhead for OpenRouter calls: concurrent calls, waiting callers and max wait
+    LLM_MAX_CONCURRENCY: int = 16
+    LLM_MAX_QUEUE: int = 128
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 10.0
+    # Circuit breaker for OpenRouter: calls failing or slower than the limit count as errors
+    LLM_BREAKER_FAILURE_RATE: float = 0.5
+    LLM_BREAKER_SLOW_CALL_SECONDS: float = 20.0
+    LLM_BREAKER_WINDOW: int = 20
+    LLM_BREAKER_MIN_CALLS: int = 5
+    LLM_BREAKER_OPEN_SECONDS: float = 30.0
 
     model_config = {
         "env_file": ".env",
@@ -1,11 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 import os
 
 # Import your routers - FIXED IMPORT PATHS
 from app.api.endpoints import auth, logs, dashboard, insights, leaderboard, profile, ai
 from app.core.config import settings
 from app.core.database import import_models
+from app.services.ai_service import calculation_cache, close_http_client, get_http_client
+from app.services.pagination import NEXT_CURSOR_HEADER
 
 # Import models first
 import_models()
@@ -30,8 +33,37 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cursor pagination returns the next page's cursor in this header
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+_cache_purge_task = None
+
+async def purge_calculation_cache():
+    # Entries are keyed on free-text details, so expired rows must be deleted or the file only grows
+    interval = settings.CALCULATION_CACHE_PURGE_INTERVAL_SECONDS
+    while True:
+        removed = await asyncio.to_thread(calculation_cache.purge_expired)
+        if removed:
+            print(f"🧹 Purged {removed} expired calculation cache entries")
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
+
+@app.on_event("startup")
+async def startup_event():
+    global _cache_purge_task
+    # Open the pooled OpenRouter client once instead of per request
+    get_http_client()
+    _cache_purge_task = asyncio.create_task(purge_calculation_cache())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if _cache_purge_task is not None:
+        _cache_purge_task.cancel()
+    await close_http_client()
+    calculation_cache.close()
+
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["authentication"])
 app.include_router(logs.router, prefix="/api/logs", tags=["logs"])
@@ -1,5 +1,5 @@
 # app/models/log.py
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..core.database import Base
@@ -17,4 +17,12 @@ class Log(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Use string-based relationship
-    user = relationship("User", back_populates="logs")
\ No newline at end of file
+    user = relationship("User", back_populates="logs")
+
+    # Existing databases get these through ecopulse/alembic (alembic upgrade head)
+    __table_args__ = (
+        # Serves per-user date-range queries (weekly insights, monthly summaries)
+        Index("ix_logs_user_id_activity_date", "user_id", "activity_date"),
+        # Serves the newest-first log listing and its cursor seeks
+        Index("ix_logs_user_id_created_at", "user_id", "created_at"),
+    )
\ No newline at end of file
@@ -1,19 +1,95 @@
 import os
+import time
 import httpx
 import re
 import json
+from typing import List, Optional
 from fastapi import HTTPException
 from ..core.config import settings
+from .bulkhead import BACKGROUND, INTERACTIVE, Bulkhead
+from .calculation_cache import CalculationCache, normalize_key
+from .circuit_breaker import CircuitBreaker
+from .singleflight import SingleFlight
+
+# Identical chat messages in flight at the same time share one OpenRouter call
+_chat_in_flight = SingleFlight()
+
+# OpenRouter calls get their own concurrency limit so a slow provider cannot starve
+# the rest of the API; chat is admitted before background point calculations
+llm_bulkhead = Bulkhead(settings.LLM_MAX_CONCURRENCY, settings.LLM_MAX_QUEUE, name="openrouter")
+
+# While OpenRouter is failing or slow, skip it and answer from the fallbacks immediately
+openrouter_breaker = CircuitBreaker(
+    "openrouter",
+    failure_rate=settings.LLM_BREAKER_FAILURE_RATE,
+    slow_call_seconds=settings.LLM_BREAKER_SLOW_CALL_SECONDS,
+    window=settings.LLM_BREAKER_WINDOW,
+    min_calls=settings.LLM_BREAKER_MIN_CALLS,
+    open_seconds=settings.LLM_BREAKER_OPEN_SECONDS,
+)
+
+# Parsed calculate-points results; most users log the same few activities
+calculation_cache = CalculationCache(
+    settings.CALCULATION_CACHE_PATH,
+    ttl=settings.CALCULATION_CACHE_TTL_SECONDS,
+    front_size=settings.CALCULATION_CACHE_FRONT_SIZE,
+    busy_timeout=settings.CALCULATION_CACHE_BUSY_TIMEOUT_SECONDS,
+)
+
+# One pooled client for every OpenRouter call, so connections (and TLS sessions) are reused
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """The shared OpenRouter client; created on startup, or here on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        http2 = settings.OPENROUTER_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("⚠️ OPENROUTER_HTTP2 is set but the h2 package is not installed, using HTTP/1.1")
+                http2 = False
+        _http_client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.OPENROUTER_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OPENROUTER_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.OPENROUTER_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(
+                settings.OPENROUTER_READ_TIMEOUT_SECONDS,
+                connect=settings.OPENROUTER_CONNECT_TIMEOUT_SECONDS,
+            ),
+        )
+    return _http_client
+
+async def close_http_client():
+    global _http_client
+    client, _http_client = _http_client, None
+    if client is not None:
+        await client.aclose()
+
+def _llm_slot(priority: int):
+    return llm_bulkhead.slot(priority, settings.LLM_QUEUE_TIMEOUT_SECONDS or None)
 
 async def get_ai_response(message: str) -> str:
     """For general eco-chat"""
+    key = " ".join(message.lower().split())
+    return await _chat_in_flight.do(key, lambda: _get_ai_response(message))
+
+async def _get_ai_response(message: str) -> str:
     print(f"🔍 AI Service Debug: Received message: '{message}'")
     print(f"🔍 AI Service Debug: OPENROUTER_API_KEY exists: {bool(settings.OPENROUTER_API_KEY)}")
     
-    if settings.OPENROUTER_API_KEY:
+    if settings.OPENROUTER_API_KEY and not openrouter_breaker.allow():
+        # Checked before queueing for a slot, so an open circuit falls back at once
+        print("⚡ OpenRouter circuit open, using fallback response")
+    elif settings.OPENROUTER_API_KEY:
         print("🔍 AI Service Debug: Attempting OpenRouter API call...")
         try:
-            response = await call_openrouter_chat(message)
+            async with _llm_slot(INTERACTIVE):
+                response = await call_openrouter_chat(message)
             print(f"🔍 AI Service Debug: OpenRouter response: {response}")
             return response
         except Exception as e:
@@ -34,9 +110,21 @@ async def calculate_emission_points(activity: str, category: str, details: str =
     print(f"🔍 AI Calculation Debug: activity='{activity}', category='{category}', details='{details}'")
     
     if settings.OPENROUTER_API_KEY:
+        key = normalize_key(activity, category, details)
+        cached = await calculation_cache.aget(key)
+        if cached is not None:
+            print(f"🔍 AI Calculation Debug: Cached result: {cached}")
+            return cached
+        if not openrouter_breaker.allow():
+            print("⚡ OpenRouter circuit open, using fallback calculation")
+            return get_fallback_calculation(activity, category, details)
         try:
-            result = await ai_calculate_emission_points(activity, category, details)
+            async with _llm_slot(BACKGROUND):
+                result = await ai_calculate_emission_points(activity, category, details)
             print(f"🔍 AI Calculation Debug: AI result: {result}")
+            # Fallback results are not cached so the AI answer replaces them once it is back
+            if not result.get("fallback"):
+                await calculation_cache.aset(key, result)
             return result
         except Exception as e:
             print(f"AI calculation error: {e}")
@@ -102,26 +190,192 @@ async def ai_calculate_emission_points(activity: str, category: str, details: st
         "temperature": 0.3
     }
     
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        print(f"🔄 Calling OpenRouter for emission calculation...")
+    # The caller has already been admitted by openrouter_breaker.allow()
+    started = time.monotonic()
+    client = get_http_client()
+    print(f"🔄 Calling OpenRouter for emission calculation...")
+    try:
         response = await client.post(API_URL, headers=headers, json=payload)
+    except Exception:
+        openrouter_breaker.record_failure()
+        raise
+    
+    print(f"📊 Response status: {response.status_code}")
+    
+    if response.status_code == 200:
+        openrouter_breaker.record_success(time.monotonic() - started)
+        result = response.json()
+        print(f"OpenRouter Response: {result}")
         
-        print(f"📊 Response status: {response.status_code}")
-        
-        if response.status_code == 200:
-            result = response.json()
-            print(f"OpenRouter Response: {result}")
-            
-            if "choices" in result and len(result["choices"]) > 0:
-                ai_text = result["choices"][0]["message"]["content"]
-                print(f"AI Response content: {ai_text}")
-                return parse_ai_calculation(ai_text)
+        if "choices" in result and len(result["choices"]) > 0:
+            ai_text = result["choices"][0]["message"]["content"]
+            print(f"AI Response content: {ai_text}")
+            return parse_ai_calculation(ai_text)
+        else:
+            print(f"Unexpected response format: {result}")
+    
+    # If API call fails, use fallback
+    if response.status_code != 200:
+        openrouter_breaker.record_failure()
+    print(f"API call failed with status {response.status_code}: {response.text}")
+    return get_fallback_calculation(activity, category, details)
+
+async def calculate_emission_points_batch(items: List[dict]) -> List[dict]:
+    """
+    Emission and points calculation for many activities with at most one AI call
+    items: [{"activity": str, "category": str, "details": Optional[str]}, ...]
+    Returns one result per item, in order, in the calculate_emission_points format
+    """
+    results: List[Optional[dict]] = [None] * len(items)
+    keys = [normalize_key(item["activity"], item["category"], item.get("details")) for item in items]
+
+    # Cached items are answered directly; duplicates in the batch are asked once
+    pending = {}
+    if settings.OPENROUTER_API_KEY:
+        for position, key in enumerate(keys):
+            cached = await calculation_cache.aget(key)
+            if cached is not None:
+                results[position] = cached
             else:
-                print(f"Unexpected response format: {result}")
-        
-        # If API call fails, use fallback
+                pending.setdefault(key, []).append(position)
+
+    if pending:
+        unique_items = [items[positions[0]] for positions in pending.values()]
+        print(f"🔍 AI Batch Calculation Debug: {len(items)} items, {len(unique_items)} sent to AI")
+        calculated = [None] * len(unique_items)
+        if not openrouter_breaker.allow():
+            print("⚡ OpenRouter circuit open, using fallback calculations")
+        else:
+            try:
+                async with _llm_slot(BACKGROUND):
+                    calculated = await ai_calculate_emission_points_batch(unique_items)
+            except Exception as e:
+                print(f"AI batch calculation error: {e}")
+
+        for (key, positions), result in zip(pending.items(), calculated):
+            if result is None:
+                continue
+            if not result.get("fallback"):
+                await calculation_cache.aset(key, result)
+            for position in positions:
+                results[position] = result
+
+    # Anything the AI did not answer falls back one item at a time
+    for position, item in enumerate(items):
+        if results[position] is None:
+            results[position] = get_fallback_calculation(item["activity"], item["category"], item.get("details"))
+    return results
+
+async def ai_calculate_emission_points_batch(items: List[dict]) -> List[Optional[dict]]:
+    """One OpenRouter call for many activities; None for items whose answer is missing or invalid"""
+
+    activities = "\n".join(
+        f'{index}. ACTIVITY: {item["activity"]} | CATEGORY: {item["category"]} | '
+        f'DETAILS: {item.get("details") or "No additional details"}'
+        for index, item in enumerate(items)
+    )
+    prompt = f"""
+    As an environmental scientist, calculate the carbon emissions saved and eco points for each of these activities.
+    
+    {activities}
+    
+    For each activity calculate:
+    1. CARBON EMISSIONS SAVED (in kg CO2): Estimate based on typical emissions for this type of activity
+    2. ECO POINTS: Award points based on environmental impact (1 point per 0.1 kg CO2 saved)
+    
+    IMPORTANT: Return ONLY a valid JSON array with one object per activity, in this exact format:
+    [
+        {{"index": 0, "carbon_emission": 1.25, "eco_points": 12, "explanation": "Brief explanation"}}
+    ]
+    
+    Guidelines:
+    - Transportation (cycling, walking, public transit): 0.5-5 kg CO2 saved per trip
+    - Energy conservation: 0.1-3 kg CO2 saved per action  
+    - Waste reduction: 0.1-2 kg CO2 saved per action
+    - Sustainable food: 0.5-4 kg CO2 saved per meal
+    - Eco-shopping: 0.1-2 kg CO2 saved per purchase
+    
+    Be realistic and conservative. Round to 2 decimal places.
+    """
+    
+    API_URL = "https://openrouter.ai/api/v1/chat/completions"
+    headers = {
+        "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
+        "HTTP-Referer": "http://localhost:8080",
+        "X-Title": "EcoPulse",
+        "Content-Type": "application/json"
+    }
+    
+    payload = {
+        "model": "deepseek/deepseek-r1-0528:free",
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are an environmental scientist specializing in carbon emissions calculation. Always respond with a valid JSON array in the exact format specified. Do not include any additional text outside the JSON."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        # Roughly 80 tokens per answer on top of the base budget
+        "max_tokens": min(4000, 300 + 80 * len(items)),
+        "temperature": 0.3
+    }
+    
+    # The caller has already been admitted by openrouter_breaker.allow()
+    started = time.monotonic()
+    client = get_http_client()
+    print(f"🔄 Calling OpenRouter for {len(items)} emission calculations...")
+    try:
+        response = await client.post(API_URL, headers=headers, json=payload)
+    except Exception:
+        openrouter_breaker.record_failure()
+        raise
+    
+    print(f"📊 Response status: {response.status_code}")
+    
+    if response.status_code != 200:
+        openrouter_breaker.record_failure()
         print(f"API call failed with status {response.status_code}: {response.text}")
-        return get_fallback_calculation(activity, category, details)
+        return [None] * len(items)
+
+    openrouter_breaker.record_success(time.monotonic() - started)
+    result = response.json()
+    if "choices" in result and len(result["choices"]) > 0:
+        return parse_ai_calculation_batch(result["choices"][0]["message"]["content"], len(items))
+    print(f"Unexpected response format: {result}")
+    return [None] * len(items)
+
+def parse_ai_calculation_batch(ai_text: str, count: int) -> List[Optional[dict]]:
+    """Parse a JSON array answer into one result per item; None where an entry is missing or invalid"""
+    parsed: List[Optional[dict]] = [None] * count
+    cleaned_text = ai_text.strip()
+    try:
+        data = json.loads(cleaned_text)
+    except Exception:
+        # Models sometimes wrap the array in prose or code fences
+        array_match = re.search(r'\[.*\]', cleaned_text, re.DOTALL)
+        try:
+            data = json.loads(array_match.group()) if array_match else []
+        except Exception as e:
+            print(f"Error parsing AI batch response: {e}")
+            data = []
+    if not isinstance(data, list):
+        data = []
+
+    for position, entry in enumerate(data):
+        try:
+            index = int(entry.get("index", position))
+            if 0 <= index < count and parsed[index] is None:
+                parsed[index] = {
+                    "carbon_emission": float(entry["carbon_emission"]),
+                    "eco_points": int(entry["eco_points"]),
+                    "explanation": entry.get("explanation", "AI-calculated based on activity details")
+                }
+        except Exception as e:
+            print(f"Skipping invalid AI batch entry {entry!r}: {e}")
+    return parsed
 
 def parse_ai_calculation(ai_text: str) -> dict:
     """Parse AI response to extract calculation data"""
@@ -187,7 +441,8 @@ def get_fallback_calculation(activity: str, category: str, details: str) -> dict
     return {
         "carbon_emission": round(base["emission"], 2),
         "eco_points": base["points"],
-        "explanation": f"Calculated based on {category} activity: {activity}"
+        "explanation": f"Calculated based on {category} activity: {activity}",
+        "fallback": True
     }
 
 async def call_openrouter_chat(message: str) -> str:
@@ -228,36 +483,51 @@ async def call_openrouter_chat(message: str) -> str:
         "temperature": 0.7
     }
     
+    # The caller has already been admitted by openrouter_breaker.allow()
+    started = time.monotonic()
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            print(f"🔄 Calling OpenRouter API...")
-            response = await client.post(API_URL, headers=headers, json=payload)
+        client = get_http_client()
+        print(f"🔄 Calling OpenRouter API...")
+        response = await client.post(API_URL, headers=headers, json=payload)
+        
+        print(f"📊 Response status: {response.status_code}")
+        
+        if response.status_code == 200:
+            openrouter_breaker.record_success(time.monotonic() - started)
+            result = response.json()
+            print(f"📊 Raw API response: {result}")
             
-            print(f"📊 Response status: {response.status_code}")
+            if "choices" in result and len(result["choices"]) > 0:
+                ai_response = result["choices"][0]["message"]["content"].strip()
+                if ai_response:
+                    print(f"✅ OpenRouter API success: {ai_response}")
+                    return ai_response
             
-            if response.status_code == 200:
-                result = response.json()
-                print(f"📊 Raw API response: {result}")
-                
-                if "choices" in result and len(result["choices"]) > 0:
-                    ai_response = result["choices"][0]["message"]["content"].strip()
-                    if ai_response:
-                        print(f"✅ OpenRouter API success: {ai_response}")
-                        return ai_response
-                
-                return "I received your message but couldn't generate a response. Please try again."
+            return "I received your message but couldn't generate a response. Please try again."
+        
+        else:
+            print(f"❌ OpenRouter API error: {response.status_code} - {response.text}")
+            openrouter_breaker.record_failure()
+            return get_smart_fallback_response(message)
             
-            else:
-                print(f"❌ OpenRouter API error: {response.status_code} - {response.text}")
-                return get_smart_fallback_response(message)
-                
     except httpx.TimeoutException:
         print("❌ OpenRouter API timeout")
+        openrouter_breaker.record_failure()
         return get_smart_fallback_response(message)
     except Exception as e:
         print(f"❌ OpenRouter API connection error: {e}")
+        openrouter_breaker.record_failure()
         return get_smart_fallback_response(message)
 
+def get_ai_stats() -> dict:
+    """Concurrency counters for the monitoring endpoint"""
+    return {
+        "llm_bulkhead": llm_bulkhead.stats(),
+        "openrouter_circuit": openrouter_breaker.stats(),
+        "calculation_cache": calculation_cache.stats(),
+        "chat_in_flight": _chat_in_flight.stats(),
+    }
+
 def get_smart_fallback_response(message: str) -> str:
     """Provide intelligent fallback responses for common eco-questions"""
     message_lower = message.lower()
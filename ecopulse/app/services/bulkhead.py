@@ -0,0 +1,118 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+# Priority lanes: lower values are admitted first
+INTERACTIVE = 0
+BACKGROUND = 1
+LANE_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+
+class BulkheadFull(Exception):
+    """Raised when the wait queue is full or a caller waited longer than its timeout"""
+
+
+class Bulkhead:
+    """Async concurrency limit with a bounded, prioritized wait queue.
+
+    At most ``max_concurrent`` callers hold a slot at once. Others wait in a queue of at
+    most ``max_queue`` entries; a freed slot goes to the waiting caller with the lowest
+    priority value (interactive before background), first come first served within a
+    lane. Waiting only costs a coroutine, so slow upstream calls cannot take over the
+    threadpool or event loop that the rest of the API depends on.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, name: str = "bulkhead"):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.name = name
+        self._active = 0
+        self._waiters = []  # heap of (priority, seq, future)
+        self._seq = itertools.count()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @asynccontextmanager
+    async def slot(self, priority: int = INTERACTIVE, timeout: Optional[float] = None):
+        await self.acquire(priority, timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: int = INTERACTIVE, timeout: Optional[float] = None):
+        started = time.monotonic()
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            self._admit(started)
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise BulkheadFull(f"{self.name}: wait queue is full")
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._seq), future)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self.release()
+            else:
+                future.cancel()
+                self._remove(entry)
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise BulkheadFull(f"{self.name}: no slot within {timeout}s") from None
+            raise
+        self._admit(started)
+
+    def release(self):
+        # Hand the slot straight to the next waiter so it cannot be taken out of order
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+
+    def _remove(self, entry):
+        try:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+        except ValueError:
+            pass
+
+    def _admit(self, started: float):
+        waited = time.monotonic() - started
+        self.admitted += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+
+    def stats(self) -> dict:
+        queued = {name: 0 for name in LANE_NAMES.values()}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                lane = LANE_NAMES.get(priority, str(priority))
+                queued[lane] = queued.get(lane, 0) + 1
+        return {
+            "active": self._active,
+            "max_concurrent": self.max_concurrent,
+            "queued": queued,
+            "queue_depth": sum(queued.values()),
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_ms": round(1000 * self._total_wait / self.admitted, 3) if self.admitted else 0.0,
+            "max_wait_ms": round(1000 * self._max_wait, 3),
+        }
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+def normalize_key(activity: str, category: str, details: Optional[str]) -> str:
+    """Case- and whitespace-insensitive cache key for one calculation request"""
+    parts = (activity, category, details or "")
+    return "\x1f".join(" ".join(part.lower().split()) for part in parts)
+
+
+class CalculationCache:
+    """Emission/points results persisted in a local SQLite file, with an in-process front cache.
+
+    The SQLite file (WAL mode) is shared by every worker on the host and survives restarts;
+    the front cache serves repeat lookups in a worker without touching the file. Entries
+    expire ``ttl`` seconds after they are stored. The async ``aget``/``aset`` answer front
+    cache hits inline and run file access in a thread, so a worker holding the write lock
+    never stalls the event loop; waiting longer than ``busy_timeout`` counts as a miss.
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, front_size: int = 1024,
+                 busy_timeout: float = 0.1):
+        self.path = path
+        self.ttl = ttl
+        self.front_size = front_size
+        self.busy_timeout = busy_timeout
+        self.hits = 0
+        self.misses = 0
+        self._front: "OrderedDict[str, tuple]" = OrderedDict()
+        # _lock guards the front cache and counters; _db_lock serializes use of the connection
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS emission_calculations ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[dict]:
+        cached = self._front_get(key)
+        return cached if cached is not None else self._disk_get(key)
+
+    async def aget(self, key: str) -> Optional[dict]:
+        cached = self._front_get(key)
+        return cached if cached is not None else await asyncio.to_thread(self._disk_get, key)
+
+    def set(self, key: str, result: dict):
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, dict(result), expires_at)
+        self._disk_set(key, result, expires_at)
+
+    async def aset(self, key: str, result: dict):
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, dict(result), expires_at)
+        await asyncio.to_thread(self._disk_set, key, result, expires_at)
+
+    def purge_expired(self) -> int:
+        """Delete expired rows from the file; returns how many were removed"""
+        try:
+            with self._db_lock:
+                return self._connect().execute(
+                    "DELETE FROM emission_calculations WHERE expires_at <= ?", (time.time(),)
+                ).rowcount
+        except sqlite3.Error as e:
+            print(f"⚠️ Calculation cache purge failed: {e}")
+            return 0
+
+    def close(self):
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        with self._lock:
+            self._front.clear()
+
+    def _front_get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._front.get(key)
+            if entry is None or entry[1] <= time.time():
+                return None
+            self._front.move_to_end(key)
+            self.hits += 1
+            return dict(entry[0])
+
+    def _disk_get(self, key: str) -> Optional[dict]:
+        try:
+            with self._db_lock:
+                row = self._connect().execute(
+                    "SELECT result, expires_at FROM emission_calculations WHERE key = ? AND expires_at > ?",
+                    (key, time.time()),
+                ).fetchone()
+        except sqlite3.Error as e:
+            # A broken or locked cache must never fail the request; treat it as a miss
+            print(f"⚠️ Calculation cache read failed: {e}")
+            row = None
+
+        with self._lock:
+            if row is None:
+                self._front.pop(key, None)
+                self.misses += 1
+                return None
+            result = json.loads(row[0])
+            self._remember(key, result, row[1])
+            self.hits += 1
+            return dict(result)
+
+    def _disk_set(self, key: str, result: dict, expires_at: float):
+        try:
+            with self._db_lock:
+                self._connect().execute(
+                    "INSERT OR REPLACE INTO emission_calculations (key, result, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(result), expires_at),
+                )
+        except sqlite3.Error as e:
+            print(f"⚠️ Calculation cache write failed: {e}")
+
+    def _remember(self, key: str, result: dict, expires_at: float):
+        self._front[key] = (result, expires_at)
+        self._front.move_to_end(key)
+        while len(self._front) > self.front_size:
+            self._front.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "front_size": len(self._front),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "ttl_seconds": self.ttl,
+        }
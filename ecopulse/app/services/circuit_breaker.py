@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker driven by error rate and latency.
+
+    Outcomes of the last ``window`` calls are kept; a call counts as failed when it
+    raises or takes at least ``slow_call_seconds``. Once ``min_calls`` outcomes are
+    known and the failed fraction reaches ``failure_rate``, the circuit opens and
+    ``allow()`` returns False for ``open_seconds``. After that one probe call is let
+    through (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_rate: float = 0.5, slow_call_seconds: float = 10.0,
+                 window: int = 20, min_calls: int = 5, open_seconds: float = 30.0):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self._outcomes = deque(maxlen=window)  # True for a failed call
+        self._opened_at = 0.0
+        self._probe_started_at = None
+        self._lock = threading.Lock()
+        self.times_opened = 0
+        self.short_circuited = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go to the provider now; False means use the fallback"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN and now - self._opened_at >= self.open_seconds:
+                self.state = HALF_OPEN
+                self._probe_started_at = None
+            if self.state == HALF_OPEN:
+                # One probe at a time; a probe that never reported back is replaced
+                if self._probe_started_at is None or now - self._probe_started_at >= self.open_seconds:
+                    self._probe_started_at = now
+                    return True
+            if self.state == CLOSED:
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self, duration: float = 0.0):
+        if duration >= self.slow_call_seconds:
+            self.record_failure()
+            return
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.state = CLOSED
+                self._outcomes.clear()
+            self._outcomes.append(False)
+
+    def record_failure(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append(True)
+            if len(self._outcomes) >= self.min_calls and self._failed_fraction() >= self.failure_rate:
+                self._open()
+
+    @asynccontextmanager
+    async def call(self):
+        """Guard one provider call: raises CircuitOpen, otherwise records its outcome"""
+        if not self.allow():
+            raise CircuitOpen(f"{self.name} circuit is open")
+        async with self.record():
+            yield
+
+    @asynccontextmanager
+    async def record(self):
+        """Record the outcome of one call that ``allow()`` has already admitted.
+
+        Lets callers check the circuit before waiting for other resources (e.g. a
+        bulkhead slot) and only time the provider call itself.
+        """
+        started = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success(time.monotonic() - started)
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe_started_at = None
+        self._outcomes.clear()
+        self.times_opened += 1
+
+    def _failed_fraction(self) -> float:
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            retry_in = self._opened_at + self.open_seconds - time.monotonic() if self.state == OPEN else 0.0
+            return {
+                "state": self.state,
+                "recent_calls": len(self._outcomes),
+                "recent_failure_rate": round(self._failed_fraction(), 4),
+                "times_opened": self.times_opened,
+                "short_circuited": self.short_circuited,
+                "retry_in_seconds": round(max(0.0, retry_in), 3),
+            }
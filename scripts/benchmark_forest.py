@@ -0,0 +1,48 @@
+"""Compare sklearn and compiled-forest latency for eco-points prediction.
+
+Usage: python scripts/benchmark_forest.py
+"""
+import os
+import sys
+import time
+import warnings
+
+import joblib
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.forest import CompiledForest  # noqa: E402
+
+MODEL_PATH = "app/models/ai_model.pkl"
+
+
+def time_call(fn, repeat):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    model = joblib.load(MODEL_PATH)
+    forest = CompiledForest.from_sklearn(model)
+    rng = np.random.default_rng(0)
+
+    print(f"trees: {forest.n_trees}  nodes: {len(forest.value)}  max depth: {forest.max_depth}")
+    print(f"pickle size: {os.path.getsize(MODEL_PATH) / 1024:.0f} KiB  "
+          f"compiled arrays: {forest.nbytes / 1024:.0f} KiB")
+    print(f"{'rows':>6} {'sklearn ms':>12} {'compiled ms':>12} {'speedup':>8}")
+
+    for rows in (1, 10, 100, 1000):
+        X = rng.normal(size=(rows, model.n_features_in_))
+        repeat = 200 if rows <= 100 else 20
+        sk = time_call(lambda: model.predict(X), repeat)
+        compiled = time_call(lambda: forest.predict(X), repeat)
+        print(f"{rows:>6} {sk * 1000:>12.3f} {compiled * 1000:>12.3f} {sk / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Publish the committed model pickles as a memory-mapped registry artifact.
+
+Usage: python scripts/export_model.py [--force]
+
+Run at build/deploy time so a fresh instance's startup maps the artifact instead of
+unpickling the model, which would import joblib, scikit-learn and SciPy before serving.
+Does nothing if the registry already has a loadable current version, unless --force.
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+os.chdir(ROOT)  # model paths are relative to the project root
+
+from app.services.ai_service import ai_service  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="re-export even if a current version loads")
+    args = parser.parse_args()
+
+    if args.force:
+        import joblib
+
+        from app.services.model_artifacts import ModelArtifact
+
+        artifact = ModelArtifact.from_fitted(
+            joblib.load(ai_service.model_path),
+            joblib.load(ai_service.encoder_path),
+            joblib.load(ai_service.scaler_path),
+        )
+        version = ai_service.registry.publish(artifact)
+    elif ai_service.load_model():
+        version = ai_service.model_version
+    else:
+        sys.exit(f"No model pickles at {ai_service.model_path} and no registry version to export")
+
+    print(f"Registry {ai_service.registry_dir} current version: {version}")
+    ai_service.close()
+
+
+if __name__ == "__main__":
+    main()
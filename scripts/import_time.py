@@ -0,0 +1,68 @@
+"""Summarise `python -X importtime` for the API's cold start.
+
+Usage: python scripts/import_time.py [module] [--top N]
+
+Runs a fresh interpreter that imports ``module`` (default: app.main), then attributes
+each module's own ("self") import time to its top-level package and prints the slowest
+packages and the total.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( +)(\S+)$")
+
+
+def measure(module: str) -> list:
+    env = dict(os.environ)
+    # app.core.config refuses to start without these
+    env.setdefault("SECRET_KEY", "import-time-report")
+    env.setdefault("REFRESH_SECRET_KEY", "import-time-report")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            depth = (len(indent) - 1) // 2
+            entries.append((name, depth, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", nargs="?", default="app.main")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    entries = measure(args.module)
+    by_package = defaultdict(int)
+    for name, _, self_us, _ in entries:
+        by_package[name.split(".")[0]] += self_us
+
+    total_us = sum(by_package.values())
+    print(f"{'package':<30} {'ms':>9} {'share':>7}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"{package:<30} {self_us / 1000:>9.1f} {self_us / total_us:>6.1%}")
+    print(f"{'total':<30} {total_us / 1000:>9.1f}")
+
+    heavy = sorted({name.split(".")[0] for name, *_ in entries} & {"pandas", "sklearn", "scipy", "joblib"})
+    if heavy:
+        print(f"\ntraining-only packages imported: {', '.join(heavy)}")
+
+
+if __name__ == "__main__":
+    main()
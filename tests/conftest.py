@@ -18,3 +18,28 @@ def setup_test_env():
     """Setup test environment variables."""
     os.environ["OPENAI_API_KEY"] = "test_key"
     yield
+
+@pytest.fixture(autouse=True)
+def isolated_model_paths(tmp_path, monkeypatch):
+    """Point every AIService at tmp_path so tests never overwrite the committed
+    models or publish into the real app/models/registry."""
+    from app.services import ai_service as ai_service_module
+
+    model_dir = tmp_path / "models"
+    paths = {
+        "model_path": str(model_dir / "ai_model.pkl"),
+        "encoder_path": str(model_dir / "label_encoder.pkl"),
+        "scaler_path": str(model_dir / "scaler.pkl"),
+        "registry_dir": str(model_dir / "registry"),
+    }
+    original_init = ai_service_module.AIService.__init__
+
+    def init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        for name, value in paths.items():
+            setattr(self, name, value)
+
+    monkeypatch.setattr(ai_service_module.AIService, "__init__", init)
+    for name, value in paths.items():
+        monkeypatch.setattr(ai_service_module.ai_service, name, value)
+    yield paths
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base
+from app.utils.activity_stats import bucketed_emissions, emissions_between, month_range
+
+NOW = datetime(2024, 3, 15, 12, 0)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        models.User(id=1, username="a", email="a@example.com", password="x"),
+        models.User(id=2, username="b", email="b@example.com", password="x"),
+    ])
+    session.flush()
+    yield session
+    session.close()
+
+
+def add(db, user_id, carbon_output, created_at):
+    db.add(models.Activity(user_id=user_id, name="x", category="Food", carbon_output=carbon_output,
+                           created_at=created_at))
+
+
+def test_daily_buckets_and_total(db):
+    add(db, 1, 1.0, NOW - timedelta(hours=1))       # today
+    add(db, 1, 2.0, NOW - timedelta(hours=23))      # today
+    add(db, 1, 4.0, NOW - timedelta(days=1, hours=1))
+    add(db, 1, 8.0, NOW - timedelta(days=6, hours=23))
+    add(db, 1, 16.0, NOW - timedelta(days=30))      # total only
+    add(db, 1, 32.0, NOW + timedelta(hours=1))      # future: total only
+    add(db, 2, 64.0, NOW - timedelta(hours=1))      # another user
+    db.commit()
+
+    stats = bucketed_emissions(db, 1, timedelta(days=1), 7, now=NOW)
+    assert stats.emissions == [3.0, 4.0, 0.0, 0.0, 0.0, 0.0, 8.0]
+    assert stats.counts == [2, 1, 0, 0, 0, 0, 1]
+    assert stats.total_emissions == 63.0
+    assert stats.total_count == 6
+
+
+def test_runs_a_single_query(db):
+    add(db, 1, 1.0, NOW - timedelta(hours=1))
+    db.commit()
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    bucketed_emissions(db, 1, timedelta(weeks=1), 4, now=NOW)
+    assert len(statements) == 1
+    assert "GROUP BY" in statements[0]
+
+
+def test_empty_history(db):
+    stats = bucketed_emissions(db, 1, timedelta(days=1), 7, now=NOW)
+    assert stats.emissions == [0.0] * 7
+    assert stats.total_emissions == 0.0 and stats.total_count == 0
+
+
+def test_weekly_buckets_up_to_a_year(db):
+    add(db, 1, 1.0, NOW - timedelta(days=3))
+    add(db, 1, 2.0, NOW - timedelta(weeks=51, days=1))
+    add(db, 1, 4.0, NOW - timedelta(weeks=53))
+    db.commit()
+
+    stats = bucketed_emissions(db, 1, timedelta(weeks=1), 52, now=NOW)
+    assert len(stats.emissions) == 52
+    assert stats.emissions[0] == 1.0 and stats.emissions[51] == 2.0
+    assert sum(stats.counts) == 2 and stats.total_count == 3
+
+
+def test_month_range_is_half_open():
+    assert month_range(2024, 2) == (datetime(2024, 2, 1), datetime(2024, 3, 1))
+    assert month_range(2023, 12) == (datetime(2023, 12, 1), datetime(2024, 1, 1))
+
+
+
+def test_summary_rejects_the_last_representable_month(db, monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", "test")
+    monkeypatch.setenv("REFRESH_SECRET_KEY", "test")
+    from fastapi import HTTPException
+
+    from app.routes.insights import get_monthly_summary
+
+    with pytest.raises(HTTPException) as excinfo:
+        get_monthly_summary(month="9999-12", db=db, current_user=db.get(models.User, 1))
+    assert excinfo.value.status_code == 400
+
+def test_emissions_between_uses_user_date_index(db):
+    add(db, 1, 1.5, datetime(2024, 2, 1))
+    add(db, 1, 2.5, datetime(2024, 2, 29, 23, 59))
+    add(db, 1, 4.0, datetime(2024, 3, 1))  # excluded: end is exclusive
+    db.commit()
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute",
+                 lambda conn, cursor, statement, parameters, *args: statements.append((statement, parameters)))
+
+    assert emissions_between(db, 1, *month_range(2024, 2)) == (4.0, 2)
+
+    statement, parameters = statements[-1]
+    plan = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "USING INDEX ix_activities_user_id_created_at" in details or \
+        "USING COVERING INDEX ix_activities_user_id_created_at" in details, details
+    assert "created_at>? AND created_at<?" in details, details
+
+
+def test_windowed_buckets_skip_older_history(db):
+    add(db, 1, 1.0, NOW - timedelta(days=3))
+    add(db, 1, 2.0, NOW - timedelta(weeks=3, days=1))
+    add(db, 1, 4.0, NOW - timedelta(weeks=10))      # outside the window
+    add(db, 1, 8.0, NOW + timedelta(hours=1))       # future
+    db.commit()
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute",
+                 lambda conn, cursor, statement, parameters, *args: statements.append((statement, parameters)))
+
+    stats = bucketed_emissions(db, 1, timedelta(weeks=1), 4, now=NOW, with_totals=False)
+    assert stats.emissions == [1.0, 0.0, 0.0, 2.0]
+    assert stats.counts == [1, 0, 0, 1]
+    assert (stats.total_emissions, stats.total_count) == (3.0, 2)
+    assert stats.emissions == bucketed_emissions(db, 1, timedelta(weeks=1), 4, now=NOW).emissions
+
+    statement, parameters = statements[0]
+    plan = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_activities_user_id_created_at" in details and "created_at>? AND created_at<?" in details, details
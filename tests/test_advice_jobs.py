@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from app.services.advice_jobs import AdviceJobManager
+
+
+class SlowService:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+
+    async def generate_response(self, message, activity, category, carbon_emission, eco_points, **kwargs):
+        self.calls.append((message, kwargs))
+        await asyncio.sleep(self.delay)
+        return f"advice for {activity}"
+
+    def _generate_fallback_response(self, category=None):
+        return "fallback advice"
+
+
+@pytest.mark.asyncio
+async def test_submit_returns_immediately_and_advice_arrives_later():
+    service = SlowService()
+    manager = AdviceJobManager(service, workers=2)
+    try:
+        advice_id = manager.submit(1, "I logged cycling", "cycling", "Transportation", 0.5, 95.0)
+        job = manager.get(advice_id)
+        assert job["status"] == "pending" and job["advice"] is None
+        assert "done" not in job
+
+        job = await manager.wait(advice_id, timeout=2)
+        assert job["status"] == "ready"
+        assert job["advice"] == "advice for cycling"
+        assert job["user_id"] == 1
+        assert service.calls[0][1]["template"] == "log"
+        assert manager.get("missing") is None
+    finally:
+        await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_falls_back_without_waiting():
+    manager = AdviceJobManager(SlowService(delay=1), workers=1, max_pending=1)
+    try:
+        ids = [manager.submit(1, "m", "a", "Food", 1.0, 50.0) for _ in range(3)]
+        statuses = [manager.get(advice_id) for advice_id in ids]
+        assert statuses[-1]["status"] == "ready"
+        assert statuses[-1]["advice"] == "fallback advice"
+        assert manager.stats()["shed"] >= 1
+    finally:
+        await manager.stop()
@@ -1,5 +1,7 @@
+import time
 import pytest
 from app.services.ai_service import AIService
+from app.services.cache import TTLCache
 import pandas as pd
 import numpy as np
 from unittest.mock import patch
@@ -15,13 +17,27 @@ def test_generate_training_data(ai_service):
     assert len(df) == 10
     assert all(col in df.columns for col in ['activity', 'category', 'carbon_emission', 'eco_points'])
 
+def test_generate_training_data_is_deterministic_and_in_range(ai_service):
+    from app.services.ai_service import ACTIVITY_TEMPLATES, CATEGORY_EMISSIONS
+    df = ai_service.generate_training_data(n_samples=2000)
+    assert df.equals(ai_service.generate_training_data(n_samples=2000))
+    for category, group in df.groupby("category"):
+        limits = CATEGORY_EMISSIONS[category]
+        assert group["carbon_emission"].between(limits["min"], limits["max"]).all()
+        assert set(group["activity"]) <= set(ACTIVITY_TEMPLATES[category])
+    assert (df["eco_points"] >= 0).all()
+
+def test_iter_training_data_chunks(ai_service):
+    chunks = list(ai_service.iter_training_data(2500, chunk_size=1000))
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+
 def test_train_model(ai_service):
     result = ai_service.train_model(n_samples=100)
     assert isinstance(result, dict)
     assert 'mse' in result
     assert 'r2_score' in result
     assert ai_service.is_trained
-    assert ai_service.model is not None
+    assert ai_service.artifact is not None
 
 def test_predict_eco_points(ai_service):
     # Test with model not trained (fallback prediction)
@@ -76,6 +92,112 @@ async def test_generate_response(ai_service):
     assert isinstance(response, str)
     assert len(response) > 0
 
+@pytest.mark.asyncio
+async def test_generate_response_uses_shared_async_client(ai_service):
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock, MagicMock
+
+    completion = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=" Great job! "))])
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(return_value=completion)
+    client.close = AsyncMock()
+    ai_service.openai_client = client
+
+    assert ai_service.open_openai_client() is client
+    response = await ai_service.generate_response("Any tips?", "cycling", "Transportation", 0.0, 100.0)
+    assert response == "Great job!"
+    client.chat.completions.create.assert_awaited_once()
+
+    await ai_service.close_openai_client()
+    client.close.assert_awaited_once()
+    assert ai_service.openai_client is None
+
+@pytest.mark.asyncio
+async def test_generate_response_caches_templated_advice(ai_service):
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock, MagicMock
+
+    completion = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="Nice ride!"))])
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(return_value=completion)
+    ai_service.openai_client = client
+
+    first = await ai_service.generate_response("I logged Cycling", "Cycling", "Transportation", 1.02, 98.0, template="log")
+    # Same bucket (emission 0.5, points 5) and normalized activity: served from cache
+    second = await ai_service.generate_response("I logged cycling", "cycling ", "Transportation", 0.98, 99.0, template="log")
+    assert first == second == "Nice ride!"
+    assert client.chat.completions.create.await_count == 1
+    assert ai_service.advice_cache.stats()["hits"] == 1
+
+    # Untemplated chat messages are never cached
+    await ai_service.generate_response("Any tips?", "Cycling", "Transportation", 1.0, 98.0)
+    assert client.chat.completions.create.await_count == 2
+
+@pytest.mark.asyncio
+async def test_generate_response_does_not_cache_fallback(ai_service):
+    from unittest.mock import AsyncMock, MagicMock
+
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=RuntimeError("rate limited"))
+    ai_service.openai_client = client
+
+    response = await ai_service.generate_response("I logged Beef", "Beef", "Food", 12.0, 40.0, template="log")
+    assert response in ai_service.fallback_responses["Food"]
+    assert len(ai_service.advice_cache) == 0
+
+@pytest.mark.asyncio
+async def test_stream_response_relays_deltas_and_closes_upstream(ai_service):
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock, MagicMock
+
+    class FakeStream:
+        def __init__(self, pieces):
+            self.pieces = pieces
+            self.close = AsyncMock()
+
+        async def __aiter__(self):
+            for piece in self.pieces:
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+    stream = FakeStream(["Cycling ", None, "is great!"])
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(return_value=stream)
+    ai_service.openai_client = client
+
+    pieces = [piece async for piece in ai_service.stream_response("Tips?", category="Transportation")]
+    assert pieces == ["Cycling ", "is great!"]
+    assert client.chat.completions.create.await_args.kwargs["stream"] is True
+    stream.close.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_stream_response_falls_back_in_one_piece(ai_service):
+    from unittest.mock import AsyncMock, MagicMock
+
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=RuntimeError("unavailable"))
+    ai_service.openai_client = client
+
+    pieces = [piece async for piece in ai_service.stream_response("Tips?", category="Energy")]
+    assert len(pieces) == 1
+    assert pieces[0] in ai_service.fallback_responses["Energy"]
+
+@pytest.mark.asyncio
+async def test_open_circuit_skips_provider(ai_service):
+    from unittest.mock import AsyncMock, MagicMock
+
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=RuntimeError("provider down"))
+    ai_service.openai_client = client
+
+    for i in range(ai_service.llm_breaker.min_calls):
+        await ai_service.generate_response(f"question {i}", category="Food")
+    calls = client.chat.completions.create.await_count
+    assert ai_service.stats()["llm_circuit"]["state"] == "open"
+
+    response = await ai_service.generate_response("another question", category="Food")
+    assert response in ai_service.fallback_responses["Food"]
+    assert client.chat.completions.create.await_count == calls
+
 def test_predict_eco_points_fallback(ai_service):
     points = ai_service.predict_eco_points(
         activity="cycling to work",
@@ -83,8 +205,9 @@ def test_predict_eco_points_fallback(ai_service):
         carbon_emission=0.0
     )
     assert isinstance(points, float)
+    assert points == ai_service._fallback_prediction("cycling to work", "Transportation", 0.0)
     assert points >= 0
-    assert points <= 120  # Base points (100) + max category bonus (20)
+    assert points <= 130  # Base points (100) + max category bonus (20) + sustainable bonus (10)
 
 @patch('openai.ChatCompletion.create')
 def test_fallback_responses(mock_openai, ai_service):
@@ -93,3 +216,133 @@ def test_fallback_responses(mock_openai, ai_service):
         response = ai_service._generate_fallback_response(category)
         assert isinstance(response, str)
         assert len(response) > 0
+
+def test_predict_eco_points_batch_matches_single(ai_service):
+    ai_service.train_model(n_samples=100)
+    activities = ["cycling to work", "Beef dinner", "Home electricity", "Composting"]
+    categories = ["Transportation", "Food", "Energy", "Waste"]
+    emissions = [0.5, 12.0, 25.0, 1.0]
+
+    batch = ai_service.predict_eco_points_batch(activities, categories, emissions)
+    single = [
+        ai_service.predict_eco_points(a, c, e)
+        for a, c, e in zip(activities, categories, emissions)
+    ]
+    assert batch == single
+    assert all(isinstance(p, float) for p in batch)
+
+def test_predict_eco_points_batch_unknown_category_uses_fallback(ai_service):
+    ai_service.train_model(n_samples=100)
+    points = ai_service.predict_eco_points_batch(
+        ["walking", "Bus commute"], ["Unknown", "Transportation"], [2.0, 15.0]
+    )
+    assert points[0] == ai_service._fallback_prediction("walking", "Unknown", 2.0)
+
+def test_predict_eco_points_batch_validates_lengths(ai_service):
+    assert ai_service.predict_eco_points_batch([], [], []) == []
+    with pytest.raises(ValueError):
+        ai_service.predict_eco_points_batch(["a"], ["Food", "Energy"], [1.0])
+
+def test_prediction_cache_hits_and_is_cleared_on_retrain(ai_service):
+    ai_service.train_model(n_samples=100)
+    cache = ai_service.prediction_cache
+
+    first = ai_service.predict_eco_points_batch(["Bus commute"], ["Transportation"], [15.0])
+    again = ai_service.predict_eco_points_batch(["bus commute"], ["Transportation"], [15.0])
+    assert first == again
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+    generation = ai_service.model_generation
+    ai_service.train_model(n_samples=100)
+    assert ai_service.model_generation == generation + 1
+    assert len(cache) == 0
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=2, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+def test_predict_eco_points_runs_inline_once_dispatcher_is_closed(ai_service):
+    ai_service.train_model(n_samples=100)
+    expected = ai_service.predict_eco_points_batch(["Bus commute"], ["Transportation"], [15.0], lookup_cache=False)
+    ai_service.dispatcher.close()
+    ai_service.prediction_cache.clear()
+    assert ai_service.predict_eco_points("Bus commute", "Transportation", 15.0) == expected[0]
+
+@pytest.mark.asyncio
+async def test_open_circuit_does_not_queue_for_a_bulkhead_slot(ai_service, monkeypatch):
+    from unittest.mock import AsyncMock, MagicMock
+    from app.core.settings import settings
+    from app.services.bulkhead import Bulkhead
+
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(return_value=None)
+    ai_service.openai_client = client
+    ai_service.llm_bulkhead = Bulkhead(1, 10, name="test")
+    monkeypatch.setattr(settings, "LLM_QUEUE_TIMEOUT_SECONDS", 2.0)
+    for _ in range(ai_service.llm_breaker.min_calls):
+        ai_service.llm_breaker.record_failure()
+
+    await ai_service.llm_bulkhead.acquire(0, None)  # a slow call holds the only slot
+    try:
+        started = time.monotonic()
+        response = await ai_service.generate_response("question", category="Food")
+        assert time.monotonic() - started < 0.5
+        assert response in ai_service.fallback_responses["Food"]
+        stream = [piece async for piece in ai_service.stream_response("question", category="Food")]
+        assert time.monotonic() - started < 1.0
+        assert stream[0] in ai_service.fallback_responses["Food"]
+    finally:
+        ai_service.llm_bulkhead.release()
+    client.chat.completions.create.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_stream_records_one_breaker_outcome_when_it_ends(ai_service):
+    import asyncio
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock, MagicMock
+    from app.services.circuit_breaker import CircuitBreaker
+
+    class FakeStream:
+        def __init__(self, pieces, error=None):
+            self.pieces, self.error = pieces, error
+            self.close = AsyncMock()
+
+        async def __aiter__(self):
+            for piece in self.pieces:
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+            if self.error:
+                raise self.error
+
+    client = MagicMock()
+    ai_service.openai_client = client
+
+    # Mid-stream failure: one failure, no success for the headers that arrived first
+    ai_service.llm_breaker = CircuitBreaker("test", min_calls=10)
+    client.chat.completions.create = AsyncMock(return_value=FakeStream(["Hi"], RuntimeError("reset")))
+    assert [piece async for piece in ai_service.stream_response("Tips?")] == ["Hi"]
+    assert ai_service.llm_breaker.stats()["recent_calls"] == 1
+    assert ai_service.llm_breaker.stats()["recent_failure_rate"] == 1.0
+
+    # Half-open probe: the circuit closes only once the stream has finished
+    ai_service.llm_breaker = CircuitBreaker("test", min_calls=1, open_seconds=0.01)
+    ai_service.llm_breaker.record_failure()
+    await asyncio.sleep(0.02)
+    client.chat.completions.create = AsyncMock(return_value=FakeStream(["Cycling ", "is great!"]))
+    stream = ai_service.stream_response("Tips?")
+    assert await stream.__anext__() == "Cycling "
+    assert ai_service.llm_breaker.state == "half_open"
+    assert [piece async for piece in stream] == ["is great!"]
+    assert ai_service.llm_breaker.state == "closed"
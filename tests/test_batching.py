@@ -0,0 +1,79 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+from app.services.batching import MicroBatchDispatcher
+
+
+def test_concurrent_submits_are_batched():
+    calls = []
+
+    def batch_fn(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    dispatcher = MicroBatchDispatcher(batch_fn, window_ms=50, max_batch_size=100)
+    results = {}
+    barrier = threading.Barrier(20)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = dispatcher.submit(i).result(timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    dispatcher.close()
+
+    assert results == {i: i * 2 for i in range(20)}
+    assert len(calls) < 20
+    assert dispatcher.stats()["items"] == 20
+
+
+def test_max_batch_size_is_respected():
+    sizes = []
+
+    def batch_fn(items):
+        sizes.append(len(items))
+        return items
+
+    dispatcher = MicroBatchDispatcher(batch_fn, window_ms=20, max_batch_size=3)
+    futures = [dispatcher.submit(i) for i in range(10)]
+    assert [f.result(timeout=5) for f in futures] == list(range(10))
+    dispatcher.close()
+    assert max(sizes) <= 3
+
+
+def test_batch_errors_propagate_to_every_caller():
+    def batch_fn(items):
+        raise ValueError("boom")
+
+    dispatcher = MicroBatchDispatcher(batch_fn, window_ms=1)
+    future = dispatcher.submit(1)
+    with pytest.raises(ValueError):
+        future.result(timeout=5)
+    dispatcher.close()
+    with pytest.raises(RuntimeError):
+        dispatcher.submit(2)
+
+
+def test_items_left_behind_close_fail_instead_of_hanging():
+    release = threading.Event()
+
+    def batch_fn(items):
+        release.wait(5)
+        return items
+
+    dispatcher = MicroBatchDispatcher(batch_fn, window_ms=1)
+    first = dispatcher.submit(1)
+    dispatcher.close(timeout=0)
+    # Simulates an item that raced in behind the stop marker
+    straggler = Future()
+    dispatcher._queue.put((2, straggler))
+    release.set()
+
+    assert first.result(timeout=5) == 1
+    with pytest.raises(RuntimeError):
+        straggler.result(timeout=5)
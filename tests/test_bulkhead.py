@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from app.services.bulkhead import BACKGROUND, INTERACTIVE, Bulkhead, BulkheadFull
+
+
+@pytest.mark.asyncio
+async def test_limits_concurrency():
+    bulkhead = Bulkhead(max_concurrent=2, max_queue=10)
+    running = peak = 0
+
+    async def work():
+        nonlocal running, peak
+        async with bulkhead.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(work() for _ in range(8)))
+    assert peak == 2
+    stats = bulkhead.stats()
+    assert stats["admitted"] == 8
+    assert stats["active"] == 0 and stats["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_interactive_lane_is_admitted_first():
+    bulkhead = Bulkhead(max_concurrent=1, max_queue=10)
+    order = []
+    await bulkhead.acquire()
+
+    async def work(name, priority):
+        async with bulkhead.slot(priority):
+            order.append(name)
+
+    tasks = [asyncio.ensure_future(work("background", BACKGROUND))]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.ensure_future(work("interactive", INTERACTIVE)))
+    await asyncio.sleep(0)
+    assert bulkhead.stats()["queued"] == {"interactive": 1, "background": 1}
+
+    bulkhead.release()
+    await asyncio.gather(*tasks)
+    assert order == ["interactive", "background"]
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full_or_wait_times_out():
+    bulkhead = Bulkhead(max_concurrent=1, max_queue=1)
+    await bulkhead.acquire()
+    waiter = asyncio.ensure_future(bulkhead.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(BulkheadFull):
+        await bulkhead.acquire()
+    assert bulkhead.stats()["rejected"] == 1
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    with pytest.raises(BulkheadFull):
+        await bulkhead.acquire(timeout=0.01)
+    assert bulkhead.stats()["timed_out"] == 1
+    assert bulkhead.stats()["queue_depth"] == 0
+
+    bulkhead.release()
+    assert bulkhead.stats()["active"] == 0
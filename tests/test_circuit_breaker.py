@@ -0,0 +1,55 @@
+import pytest
+
+from app.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+
+
+def test_opens_on_error_rate_and_short_circuits(monkeypatch):
+    breaker = CircuitBreaker("test", failure_rate=0.5, window=10, min_calls=4, open_seconds=30)
+    for _ in range(2):
+        breaker.record_success(0.1)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["short_circuited"] == 1
+
+
+def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker("test", slow_call_seconds=1.0, min_calls=3)
+    for _ in range(3):
+        breaker.record_success(5.0)
+    assert breaker.state == OPEN
+
+
+def test_half_open_probe_closes_or_reopens(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.services.circuit_breaker.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker("test", min_calls=1, open_seconds=30)
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    now[0] += 31
+    assert breaker.allow()  # the probe
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    now[0] += 31
+    assert breaker.allow()
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["times_opened"] == 2
+
+
+@pytest.mark.asyncio
+async def test_call_guard_records_outcomes():
+    breaker = CircuitBreaker("test", min_calls=2)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            async with breaker.call():
+                raise RuntimeError("provider down")
+    with pytest.raises(CircuitOpen):
+        async with breaker.call():
+            pass
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from ecopulse.app.services import ai_service
+from ecopulse.app.services.calculation_cache import CalculationCache, normalize_key
+
+
+def entry(index=None, emission=1.0, points=10):
+    data = {"carbon_emission": emission, "eco_points": points, "explanation": "ok"}
+    if index is not None:
+        data["index"] = index
+    return data
+
+
+def test_parse_plain_array():
+    text = json.dumps([entry(0, 1.5, 15), entry(1, 2.0, 20)])
+    parsed = ai_service.parse_ai_calculation_batch(text, 2)
+    assert [p["carbon_emission"] for p in parsed] == [1.5, 2.0]
+    assert [p["eco_points"] for p in parsed] == [15, 20]
+
+
+@pytest.mark.parametrize("wrap", [
+    "```json\n{}\n```",
+    "Here are the results:\n{}\nLet me know if you need more.",
+])
+def test_parse_fenced_or_prose_wrapped_array(wrap):
+    text = wrap.format(json.dumps([entry(0), entry(1)]))
+    assert all(p is not None for p in ai_service.parse_ai_calculation_batch(text, 2))
+
+
+def test_parse_missing_index_uses_position():
+    parsed = ai_service.parse_ai_calculation_batch(json.dumps([entry(None, 1.0), entry(None, 2.0)]), 2)
+    assert [p["carbon_emission"] for p in parsed] == [1.0, 2.0]
+
+
+def test_parse_duplicate_and_out_of_range_index_keep_first_answer():
+    text = json.dumps([entry(1, 1.0), entry(1, 9.0), entry(5, 3.0)])
+    parsed = ai_service.parse_ai_calculation_batch(text, 2)
+    assert parsed[0] is None
+    assert parsed[1]["carbon_emission"] == 1.0
+
+
+def test_parse_invalid_entries_and_garbage():
+    text = json.dumps([{"index": 0, "carbon_emission": "lots"}, entry(1)])
+    parsed = ai_service.parse_ai_calculation_batch(text, 2)
+    assert parsed[0] is None and parsed[1] is not None
+    assert ai_service.parse_ai_calculation_batch("no json here", 2) == [None, None]
+    assert ai_service.parse_ai_calculation_batch('{"index": 0}', 1) == [None]
+
+
+@pytest.fixture
+def batch(tmp_path, monkeypatch):
+    """calculate_emission_points_batch against a temporary cache and a stubbed AI call"""
+    cache = CalculationCache(str(tmp_path / "calc.db"))
+    calls = []
+
+    async def fake_ai(items):
+        calls.append([item["activity"] for item in items])
+        # Answers every item except ones named "invalid"
+        return [None if item["activity"] == "invalid" else entry(i, float(i + 1)) for i, item in enumerate(items)]
+
+    monkeypatch.setattr(ai_service, "calculation_cache", cache)
+    monkeypatch.setattr(ai_service.settings, "OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setattr(ai_service, "ai_calculate_emission_points_batch", fake_ai)
+    yield cache, calls
+    cache.close()
+
+
+def item(activity, category="Transport"):
+    return {"activity": activity, "category": category, "details": None}
+
+
+@pytest.mark.asyncio
+async def test_batch_asks_duplicates_once_and_skips_cached(batch):
+    cache, calls = batch
+    cache.set(normalize_key("walk", "Transport", None), {"carbon_emission": 7.0, "eco_points": 70, "explanation": "x"})
+
+    results = await ai_service.calculate_emission_points_batch(
+        [item("bus"), item("walk"), item("Bus "), item("train")]
+    )
+    assert calls == [["bus", "train"]]
+    assert [r["carbon_emission"] for r in results] == [1.0, 7.0, 1.0, 2.0]
+
+    # Everything is cached now: no second AI call
+    await ai_service.calculate_emission_points_batch([item("train"), item("bus")])
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_invalid_answers_fall_back_per_item(batch):
+    cache, calls = batch
+    results = await ai_service.calculate_emission_points_batch([item("bus"), item("invalid")])
+    assert results[0]["carbon_emission"] == 1.0
+    assert results[1] == ai_service.get_fallback_calculation("invalid", "Transport", None)
+    assert await cache.aget(normalize_key("invalid", "Transport", None)) is None
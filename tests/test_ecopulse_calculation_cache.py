@@ -0,0 +1,103 @@
+import sqlite3
+import time
+
+import pytest
+
+from ecopulse.app.services import ai_service
+from ecopulse.app.services.calculation_cache import CalculationCache, normalize_key
+
+RESULT = {"carbon_emission": 2.5, "eco_points": 40, "explanation": "Bus ride"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CalculationCache(str(tmp_path / "calc.db"), ttl=60, busy_timeout=0.05)
+    yield cache
+    cache.close()
+
+
+def test_normalize_key_ignores_case_and_whitespace():
+    assert normalize_key("Bus  Ride", "Transport", None) == normalize_key(" bus ride", "transport", "")
+
+
+def test_round_trip_survives_a_new_instance(cache):
+    assert cache.get("k") is None
+    cache.set("k", RESULT)
+    assert cache.get("k") == RESULT
+
+    other = CalculationCache(cache.path, ttl=60)
+    assert other.get("k") == RESULT  # read from the file, not the front cache
+    assert other.stats()["hits"] == 1
+    other.close()
+
+
+@pytest.mark.asyncio
+async def test_async_round_trip(cache):
+    assert await cache.aget("k") is None
+    await cache.aset("k", RESULT)
+    cache._front.clear()
+    assert await cache.aget("k") == RESULT
+
+
+def test_entries_expire_and_are_purged(tmp_path):
+    cache = CalculationCache(str(tmp_path / "calc.db"), ttl=0.05)
+    cache.set("k", RESULT)
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    assert cache.purge_expired() == 1
+    assert cache.purge_expired() == 0
+    cache.close()
+
+
+def test_corrupted_file_is_a_miss(tmp_path):
+    path = tmp_path / "calc.db"
+    path.write_bytes(b"this is not a sqlite database" * 100)
+    cache = CalculationCache(str(path))
+    assert cache.get("k") is None
+    cache.set("k", RESULT)  # must not raise
+    assert cache.purge_expired() == 0
+    cache.close()
+
+
+def test_locked_file_does_not_block_or_fail(cache):
+    cache.set("warm", RESULT)  # creates the table
+    holder = sqlite3.connect(cache.path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.monotonic()
+        cache.set("k", RESULT)  # write lock held elsewhere: dropped after busy_timeout
+        assert time.monotonic() - started < 1.0
+    finally:
+        holder.execute("ROLLBACK")
+        holder.close()
+    cache._front.clear()
+    assert cache.get("k") is None
+
+
+@pytest.fixture
+def ai_calc(cache, monkeypatch):
+    """calculate_emission_points against a temporary cache and a stubbed AI call"""
+    calls = []
+    answers = []
+
+    async def fake_ai(activity, category, details):
+        calls.append(activity)
+        return answers.pop(0)
+
+    monkeypatch.setattr(ai_service, "calculation_cache", cache)
+    monkeypatch.setattr(ai_service.settings, "OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setattr(ai_service, "ai_calculate_emission_points", fake_ai)
+    return calls, answers
+
+
+@pytest.mark.asyncio
+async def test_fallback_results_are_not_cached(ai_calc, cache):
+    calls, answers = ai_calc
+    fallback = ai_service.get_fallback_calculation("Bus ride", "Transport", None)
+    assert fallback["fallback"] is True
+    answers.extend([fallback, dict(RESULT)])
+
+    assert await ai_service.calculate_emission_points("Bus ride", "Transport") == fallback
+    assert await ai_service.calculate_emission_points("Bus ride", "Transport") == RESULT
+    assert await ai_service.calculate_emission_points("bus  ride", "Transport") == RESULT
+    assert calls == ["Bus ride", "Bus ride"]
@@ -0,0 +1,55 @@
+import sys
+
+import httpx
+import pytest
+
+from ecopulse.app.services import ai_service
+
+
+@pytest.fixture
+def client_kwargs(monkeypatch):
+    """Record the keyword arguments of every AsyncClient the service builds"""
+    created = []
+
+    class RecordingClient(httpx.AsyncClient):
+        def __init__(self, **kwargs):
+            created.append(kwargs)
+            super().__init__(**kwargs)
+
+    monkeypatch.setattr(ai_service.httpx, "AsyncClient", RecordingClient)
+    monkeypatch.setattr(ai_service, "_http_client", None)
+    return created
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_reused_until_closed(client_kwargs):
+    client = ai_service.get_http_client()
+    assert ai_service.get_http_client() is client
+    assert len(client_kwargs) == 1
+
+    await ai_service.close_http_client()
+    assert client.is_closed
+
+    reopened = ai_service.get_http_client()
+    assert reopened is not client
+    assert not reopened.is_closed
+    assert len(client_kwargs) == 2
+    await ai_service.close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_closed_client_is_replaced_on_next_use(client_kwargs):
+    client = ai_service.get_http_client()
+    await client.aclose()
+    assert ai_service.get_http_client() is not client
+    await ai_service.close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_http2_falls_back_without_h2(client_kwargs, monkeypatch):
+    monkeypatch.setattr(ai_service.settings, "OPENROUTER_HTTP2", True)
+    monkeypatch.setitem(sys.modules, "h2", None)  # makes `import h2` raise ImportError
+
+    ai_service.get_http_client()
+    assert client_kwargs[-1]["http2"] is False
+    await ai_service.close_http_client()
@@ -0,0 +1,35 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+ECOPULSE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ecopulse")
+
+
+def alembic(db_path, *args):
+    # Subprocess: ecopulse's env.py imports its own top-level `app` package
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}"}
+    subprocess.run([sys.executable, "-m", "alembic", *args], cwd=ECOPULSE_DIR, env=env, check=True,
+                   capture_output=True)
+
+
+def index_names(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'logs'")}
+
+
+def test_upgrade_adds_log_indexes_to_existing_database(tmp_path):
+    db_path = tmp_path / "ecopulse.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE logs (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, activity_type VARCHAR, "
+            "description TEXT, emissions_saved FLOAT, points_earned INTEGER, activity_date DATETIME, "
+            "created_at DATETIME)"
+        )
+
+    alembic(db_path, "upgrade", "head")
+    assert {"ix_logs_user_id_activity_date", "ix_logs_user_id_created_at"} <= index_names(db_path)
+
+    alembic(db_path, "upgrade", "head")  # idempotent
+    alembic(db_path, "downgrade", "base")
+    assert not {"ix_logs_user_id_activity_date", "ix_logs_user_id_created_at"} & index_names(db_path)
@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from ecopulse.app.core.database import Base
+from ecopulse.app.models import badge, log, user  # noqa: F401  (registers every mapper)
+from ecopulse.app.services.pagination import keyset_page
+
+Log = log.Log
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def page(db, limit, cursor=None):
+    query = db.query(Log).filter(Log.user_id == 1)
+    rows, next_cursor = keyset_page(query, Log.created_at, Log.id, limit, cursor=cursor)
+    return [row.id for row in rows], next_cursor
+
+
+def test_cursor_advances_over_server_default_timestamps(db):
+    # server_default=func.now() stores whole seconds, so all six share one timestamp
+    for _ in range(6):
+        db.execute(text("INSERT INTO logs (user_id, activity_type, emissions_saved) VALUES (1, 'bike', 1.0)"))
+    db.execute(text("INSERT INTO logs (user_id, activity_type, emissions_saved) VALUES (2, 'bike', 1.0)"))
+    db.commit()
+    assert db.execute(text("SELECT created_at FROM logs LIMIT 1")).scalar().count(".") == 0
+
+    ids, cursor = page(db, 2)
+    seen = list(ids)
+    while cursor:
+        ids, cursor = page(db, 2, cursor=cursor)
+        seen += ids
+        assert len(seen) <= 6, seen
+    assert seen == [6, 5, 4, 3, 2, 1]
+
+
+def test_cursor_from_deleted_row_still_terminates(db):
+    for _ in range(6):
+        db.execute(text("INSERT INTO logs (user_id, activity_type, emissions_saved) VALUES (1, 'bike', 1.0)"))
+    db.commit()
+    ids, cursor = page(db, 2)
+    db.query(Log).filter(Log.id == ids[-1]).delete()
+    db.commit()
+
+    # Falls back to the cursor's own timestamp; nothing older is skipped and the walk ends
+    rest = []
+    for _ in range(10):
+        ids, cursor = page(db, 2, cursor=cursor)
+        rest += ids
+        if not cursor:
+            break
+    assert cursor is None
+    assert {4, 3, 2, 1} <= set(rest)
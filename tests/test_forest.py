@@ -0,0 +1,47 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+from app.services.forest import CompiledForest
+from app.services.ai_service import AIService
+
+
+def test_compiled_forest_matches_sklearn():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 4))
+    y = X[:, 0] * 3 - X[:, 1] ** 2 + rng.normal(scale=0.1, size=400)
+    model = RandomForestRegressor(n_estimators=25, random_state=0).fit(X, y)
+
+    forest = CompiledForest.from_sklearn(model)
+    X_new = rng.normal(size=(200, 4))
+
+    assert forest.n_trees == 25
+    np.testing.assert_allclose(forest.predict(X_new), model.predict(X_new), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(forest.predict(X_new[:1]), model.predict(X_new[:1]), rtol=0, atol=1e-9)
+
+
+def test_compiled_forest_handles_single_leaf_tree():
+    model = DecisionTreeRegressor().fit(np.zeros((5, 2)), np.full(5, 7.0))
+    forest = CompiledForest.from_sklearn(model)
+    assert forest.max_depth == 0
+    np.testing.assert_allclose(forest.predict(np.ones((3, 2))), [7.0, 7.0, 7.0])
+
+
+def test_ai_service_predictions_match_sklearn_model():
+    service = AIService()
+    service.train_model(n_samples=200)
+    # The service only keeps the compiled artifact; compare against the fitted pickles it wrote
+    model = joblib.load(service.model_path)
+    encoder = joblib.load(service.encoder_path)
+    scaler = joblib.load(service.scaler_path)
+
+    activities = ["Cycling", "Beef dinner", "Solar panels", "New clothes"]
+    categories = ["Transportation", "Food", "Energy", "Shopping"]
+    emissions = [0.4, 14.2, 3.0, 20.0]
+
+    encoded, _ = service._encode_categories(encoder.classes_, np.asarray(categories))
+    features = service._build_features(np.asarray(activities), encoded, np.asarray(emissions))
+    expected = np.round(np.maximum(model.predict(scaler.transform(features)), 0), 1)
+
+    assert service.predict_eco_points_batch(activities, categories, emissions) == pytest.approx(expected.tolist())
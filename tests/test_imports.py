@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_packages(module, packages):
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(sorted({{m.split('.')[0] for m in sys.modules}} & {set(packages)!r})))"
+    )
+    env = dict(os.environ, SECRET_KEY="test", REFRESH_SECRET_KEY="test")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+def test_serving_path_does_not_import_training_dependencies():
+    assert loaded_packages("app.main", ["pandas", "sklearn", "scipy", "joblib"]) == ""
+
+
+def test_startup_with_exported_registry_does_not_import_training_dependencies(tmp_path):
+    env = dict(os.environ, SECRET_KEY="test", REFRESH_SECRET_KEY="test", MODEL_REGISTRY_DIR=str(tmp_path / "registry"))
+    export = subprocess.run([sys.executable, "scripts/export_model.py"], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert export.returncode == 0, export.stderr
+
+    code = (
+        "import asyncio, sys\n"
+        "from app.main import startup_event, shutdown_event\n"
+        "from app.services.ai_service import ai_service\n"
+        "async def run():\n"
+        "    await startup_event()\n"
+        "    assert ai_service.artifact is not None and ai_service.model_version\n"
+        "    await shutdown_event()\n"
+        "asyncio.run(run())\n"
+        "print('heavy:' + ','.join(sorted({m.split('.')[0] for m in sys.modules} & {'pandas', 'sklearn', 'scipy', 'joblib'})))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "heavy:"
@@ -0,0 +1,46 @@
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect
+
+from app import models
+
+ALEMBIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic")
+
+
+def alembic_config(monkeypatch, tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    monkeypatch.setenv("DATABASE_URL", db_url)
+    # No ini file: keeps env.py from reconfiguring logging for the rest of the suite
+    config = Config()
+    config.set_main_option("script_location", ALEMBIC_DIR)
+    return config, create_engine(db_url)
+
+
+def test_upgrade_head_creates_model_indexes(monkeypatch, tmp_path):
+    config, engine = alembic_config(monkeypatch, tmp_path)
+    command.upgrade(config, "head")
+
+    indexes = {index["name"]: index for index in inspect(engine).get_indexes("activities")}
+    expected = {index.name for index in models.Activity.__table__.indexes}
+    assert expected <= set(indexes)
+    assert indexes["ix_activities_user_id_created_at"]["column_names"] == ["user_id", "created_at"]
+    assert indexes["ix_activities_user_id_category"]["column_names"] == ["user_id", "category"]
+
+    with engine.connect() as conn:
+        sql = conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE name = 'ix_activities_active_user_id_created_at'"
+        ).scalar()
+    assert "WHERE is_archived = 0" in sql
+    engine.dispose()
+
+
+def test_downgrade_to_initial_drops_composite_indexes(monkeypatch, tmp_path):
+    config, engine = alembic_config(monkeypatch, tmp_path)
+    command.upgrade(config, "head")
+    command.downgrade(config, "-1")
+
+    names = {index["name"] for index in inspect(engine).get_indexes("activities")}
+    assert names == {"ix_activities_id", "ix_activities_name", "ix_activities_category"}
+    engine.dispose()
@@ -0,0 +1,100 @@
+import json
+import os
+import numpy as np
+import pytest
+from app.services.ai_service import AIService
+from app.services.model_registry import ModelRegistry, RegistryError
+from app.services.model_artifacts import (
+    ArtifactVersionError,
+    artifact_exists,
+    load_artifact,
+    save_artifact,
+)
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "models")
+COMMITTED_MODEL_PATHS = {
+    "model_path": os.path.join(MODELS_DIR, "ai_model.pkl"),
+    "encoder_path": os.path.join(MODELS_DIR, "label_encoder.pkl"),
+    "scaler_path": os.path.join(MODELS_DIR, "scaler.pkl"),
+}
+
+
+@pytest.fixture
+def trained_service(tmp_path):
+    service = AIService()
+    service.registry_dir = str(tmp_path / "registry")
+    service.train_model(n_samples=100)
+    return service
+
+
+def test_artifact_round_trip_is_memory_mapped(trained_service, tmp_path):
+    directory = str(tmp_path / "copy")
+    save_artifact(trained_service.artifact, directory)
+    loaded = load_artifact(directory)
+
+    assert isinstance(loaded.forest.threshold, np.memmap)
+    assert isinstance(loaded.categories, np.memmap)
+    assert list(loaded.categories) == list(trained_service.artifact.categories)
+
+    X = np.random.default_rng(0).normal(size=(50, 4))
+    np.testing.assert_array_equal(loaded.forest.predict(X), trained_service.artifact.forest.predict(X))
+
+
+def test_loaded_forest_reads_only_mapped_arrays(trained_service, tmp_path):
+    directory = str(tmp_path / "copy")
+    save_artifact(trained_service.artifact, directory)
+    forest = load_artifact(directory).forest
+
+    # Everything predict() touches is mapped as stored, with no private derived copies
+    assert all(isinstance(array, np.memmap) for array in forest.arrays().values())
+    assert set(vars(forest)) == set(forest.ARRAY_NAMES) | {"max_depth"}
+    assert forest.children.dtype == forest.feature.dtype == forest.roots.dtype == np.intp
+
+
+def test_load_artifact_rejects_other_format_versions(trained_service):
+    directory = os.path.join(trained_service.registry_dir, trained_service.model_version)
+    meta_path = os.path.join(directory, "meta.json")
+    with open(meta_path) as f:
+        meta = json.load(f)
+    meta["format_version"] = 999
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+
+    with pytest.raises(ArtifactVersionError):
+        load_artifact(directory)
+
+
+def test_load_model_exports_artifact_from_pickles(tmp_path):
+    # Reads the committed pickles; only the registry export is written
+    service = AIService()
+    service.model_path = COMMITTED_MODEL_PATHS["model_path"]
+    service.encoder_path = COMMITTED_MODEL_PATHS["encoder_path"]
+    service.scaler_path = COMMITTED_MODEL_PATHS["scaler_path"]
+    service.registry_dir = str(tmp_path / "registry")
+    assert service.registry.current_version() is None
+
+    assert service.load_model()
+    assert artifact_exists(os.path.join(service.registry_dir, service.model_version))
+    assert isinstance(service.artifact.forest.value, np.memmap)
+
+    fresh = AIService()
+    fresh.registry_dir = service.registry_dir
+    assert fresh.load_model()
+    assert fresh.predict_eco_points_batch(["Bus commute"], ["Transportation"], [15.0]) == \
+        service.predict_eco_points_batch(["Bus commute"], ["Transportation"], [15.0])
+
+
+def test_load_model_survives_a_pruned_fresh_version(tmp_path, monkeypatch):
+    service = AIService()
+    for name, path in COMMITTED_MODEL_PATHS.items():
+        setattr(service, name, path)
+    service.registry_dir = str(tmp_path / "registry")
+
+    def pruned(self, version=None, mmap=True):
+        raise RegistryError(f"Model version {version!r} is not registered")
+
+    # Another worker published in between and pruned the version this one just wrote
+    monkeypatch.setattr(ModelRegistry, "load", pruned)
+    assert service.load_model()
+    assert service.artifact is not None
+    assert service.predict_eco_points_batch(["Bus commute"], ["Transportation"], [15.0])[0] >= 0
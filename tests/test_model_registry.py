@@ -0,0 +1,71 @@
+import os
+import numpy as np
+import pytest
+from app.services.ai_service import AIService
+from app.services.model_registry import ModelRegistry, RegistryError, RegistryWatcher
+
+
+@pytest.fixture
+def trained_service(tmp_path):
+    service = AIService()
+    service.registry_dir = str(tmp_path / "registry")
+    service.train_model(n_samples=100)
+    return service
+
+
+def test_publish_records_version_metrics_and_checksum(trained_service):
+    registry = trained_service.registry
+    manifest = registry.read_manifest()
+    version = manifest["current"]
+
+    assert version == trained_service.model_version
+    assert set(manifest["versions"][version]["metrics"]) == {"mse", "r2_score"}
+    assert len(manifest["versions"][version]["checksum"]) == 64
+
+    loaded = registry.load()
+    assert isinstance(loaded.forest.value, np.memmap)
+    assert loaded.metadata["version"] == version
+
+
+def test_load_rejects_corrupted_version(trained_service):
+    registry = trained_service.registry
+    version = registry.current_version()
+    with open(os.path.join(registry.root, version, "forest_value.npy"), "r+b") as f:
+        f.seek(-8, os.SEEK_END)
+        f.write(b"\x00" * 8)
+
+    with pytest.raises(RegistryError):
+        registry.load(version)
+    with pytest.raises(RegistryError):
+        registry.load("does-not-exist")
+
+
+def test_watcher_swaps_in_versions_published_elsewhere(trained_service):
+    serving = AIService()
+    serving.registry_dir = trained_service.registry_dir
+    assert serving.load_model()
+    old_version, old_artifact = serving.model_version, serving.artifact
+
+    watcher = RegistryWatcher(serving.registry, serving.reload_model)
+    watcher.start()
+    try:
+        os.utime(serving.registry.manifest_path, ns=(0, 0))  # force an mtime change below
+        trained_service.train_model(n_samples=120)
+        watcher.check()
+    finally:
+        watcher.stop()
+
+    assert serving.model_version == trained_service.model_version != old_version
+    assert serving.artifact is not old_artifact
+    assert serving.reload_model(serving.model_version) is False
+
+
+def test_registry_prunes_old_versions(trained_service):
+    registry = ModelRegistry(trained_service.registry_dir)
+    for _ in range(ModelRegistry.KEEP_VERSIONS + 2):
+        registry.publish(trained_service.artifact)
+
+    manifest = registry.read_manifest()
+    assert len(manifest["versions"]) == ModelRegistry.KEEP_VERSIONS
+    on_disk = [name for name in os.listdir(registry.root) if not name.startswith((".", "manifest"))]
+    assert sorted(on_disk) == sorted(manifest["versions"])
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_page
+
+START = datetime(2024, 3, 1, 12, 0)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(models.User(id=1, username="a", email="a@example.com", password="x"))
+    # Pairs of activities share a timestamp, so pages must break ties on id
+    for i in range(7):
+        session.add(models.Activity(id=i + 1, user_id=1, name="x", category="Food", carbon_output=1.0,
+                                    created_at=START + timedelta(hours=i // 2)))
+    session.flush()
+    yield session
+    session.close()
+
+
+def page(db, limit, cursor=None, skip=0):
+    query = db.query(models.Activity).filter(models.Activity.user_id == 1)
+    rows, next_cursor = keyset_page(query, models.Activity.created_at, models.Activity.id, limit,
+                                    cursor=cursor, skip=skip)
+    return [row.id for row in rows], next_cursor
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(START, 42)) == (START, 42)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_cursor_pages_cover_every_row_once(db):
+    ids, cursor = page(db, 3)
+    assert ids == [7, 6, 5]
+    seen = list(ids)
+    while cursor:
+        ids, cursor = page(db, 3, cursor=cursor)
+        seen += ids
+    assert seen == [7, 6, 5, 4, 3, 2, 1]
+
+
+def test_cursor_pages_do_not_shift_on_insert(db):
+    first, cursor = page(db, 3)
+    db.add(models.Activity(user_id=1, name="x", category="Food", carbon_output=1.0,
+                           created_at=START + timedelta(days=1)))
+    db.flush()
+    assert page(db, 3, cursor=cursor)[0] == [4, 3, 2]
+    assert page(db, 3, skip=3)[0] == [5, 4, 3]  # offset path shifts by the new row
+
+
+def test_short_page_has_no_next_cursor(db):
+    assert page(db, 10) == ([7, 6, 5, 4, 3, 2, 1], None)
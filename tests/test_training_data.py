@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base
+from app.services.ai_service import AIService
+from app.services.training_data import iter_activity_chunks
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    user = models.User(username="trainer", email="trainer@example.com", password="x")
+    session.add(user)
+    session.flush()
+
+    rng = np.random.default_rng(0)
+    categories = ["Transportation", "Food", "Energy", "Waste"]
+    for i in range(300):
+        emission = float(rng.uniform(0, 30))
+        session.add(models.Activity(
+            user_id=user.id,
+            name="cycling to work" if i % 3 == 0 else "driving",
+            category=categories[i % 4],
+            carbon_output=emission,
+            eco_points=None if i % 10 == 0 else max(0.0, 100 - 2 * emission),
+            created_at=START + timedelta(hours=i),
+            is_archived=i % 25 == 0,
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_iter_activity_chunks_streams_labelled_rows(db):
+    chunks = list(iter_activity_chunks(db, chunk_size=100))
+    assert all(len(chunk["eco_points"]) <= 100 for chunk in chunks)
+    # 30 rows have no label and 12 are archived (6 of them overlap)
+    assert sum(len(chunk["eco_points"]) for chunk in chunks) == 300 - 30 - 12 + 6
+
+
+def test_iter_activity_chunks_filters_range_and_samples(db):
+    since, until = START + timedelta(hours=100), START + timedelta(hours=200)
+    in_range = sum(len(c["eco_points"]) for c in iter_activity_chunks(db, since=since, until=until))
+    assert 0 < in_range < 100
+
+    sampled = sum(len(c["eco_points"]) for c in iter_activity_chunks(db, sample_rate=0.5))
+    assert 0 < sampled < 300
+    with pytest.raises(ValueError):
+        list(iter_activity_chunks(db, sample_rate=0))
+
+
+def test_train_model_from_activities(db, tmp_path):
+    service = AIService()
+    service.model_path = str(tmp_path / "ai_model.pkl")
+    service.encoder_path = str(tmp_path / "label_encoder.pkl")
+    service.scaler_path = str(tmp_path / "scaler.pkl")
+    service.registry_dir = str(tmp_path / "registry")
+
+    metrics = service.train_model_from_activities(db, chunk_size=64)
+    assert set(metrics) == {"mse", "r2_score"}
+    assert list(service.artifact.categories) == ["Energy", "Food", "Transportation", "Waste"]
+    # Learned from the rows: low emissions earn more points than high emissions
+    low = service.predict_eco_points("driving", "Food", 1.0)
+    high = service.predict_eco_points("driving", "Food", 29.0)
+    assert low > high
+    service.close()
+
+
+def test_train_model_from_activities_needs_rows(db):
+    with pytest.raises(ValueError):
+        AIService().train_model_from_activities(db, since=START + timedelta(days=365))
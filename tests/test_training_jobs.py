@@ -0,0 +1,66 @@
+import time
+
+import pytest
+from app.services.ai_service import AIService
+from app.services.training_jobs import TrainingJobManager, TrainingQueueFull
+
+
+def wait_for(manager, job_id, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.2)
+    raise AssertionError(f"training job {job_id} did not finish")
+
+
+def test_training_job_runs_in_background_and_swaps_model(tmp_path):
+    service = AIService()
+    service.model_path = str(tmp_path / "ai_model.pkl")
+    service.encoder_path = str(tmp_path / "label_encoder.pkl")
+    service.scaler_path = str(tmp_path / "scaler.pkl")
+    service.registry_dir = str(tmp_path / "registry")
+    generation = service.model_generation
+
+    manager = TrainingJobManager(service)
+    try:
+        job = manager.submit(n_samples=200)
+        assert job["status"] == "queued"
+
+        job = wait_for(manager, job["job_id"])
+        assert job["status"] == "completed", job["error"]
+        assert job["progress"] == 1.0
+        assert set(job["metrics"]) == {"mse", "r2_score"}
+        assert service.model_generation == generation + 1
+        assert service.artifact is not None
+        assert manager.get("missing") is None
+    finally:
+        manager.shutdown()
+
+
+def test_failed_training_job_reports_error(tmp_path):
+    service = AIService()
+    service.model_path = str(tmp_path / "missing-dir" / "nested" / "\0bad.pkl")
+    service.registry_dir = str(tmp_path / "registry")
+
+    manager = TrainingJobManager(service)
+    try:
+        job = wait_for(manager, manager.submit(n_samples=50)["job_id"])
+        assert job["status"] == "failed"
+        assert job["error"]
+    finally:
+        manager.shutdown()
+
+
+def test_submit_is_refused_while_every_slot_is_busy():
+    manager = TrainingJobManager(AIService(), max_workers=1)
+    try:
+        job = manager.submit(n_samples=100)
+        with pytest.raises(TrainingQueueFull):
+            manager.submit(n_samples=100)
+
+        assert wait_for(manager, job["job_id"])["status"] == "completed"
+        assert manager.submit(n_samples=100)["status"] == "queued"
+    finally:
+        manager.shutdown()